@@ -17,6 +17,9 @@ class LLMConfig:
     chat_model: str = "deepseek-chat"
     reasoner_model: str = "deepseek-reasoner"
     temperature: float = 0.7
+    scc_context_tokens: int = 15000  # Code budget for one SCC overview prompt
+    scc_batch_cycle_tokens: int = 4000  # Cycles at or below this size may share one LLM call
+    scc_batch_tokens: int = 20000  # Code budget for a batched SCC prompt (0 disables batching)
 
     def __post_init__(self):
         if self.api_key is None:
@@ -32,6 +35,9 @@ class ProcessingConfig:
     review_timeout: int = 60    # seconds
     max_plan_retries: int = 2
     scc_max_retries: int = 3
+    max_backoff: float = 60.0  # seconds, cap for jittered retry backoff
+    speculative_replan: bool = False  # Draft the next plan while the current one is reviewed
+    dag_scheduling: bool = False  # Start each module when its dependencies finish instead of per batch
 
 
 @dataclass
@@ -90,6 +96,13 @@ class RAGConfig:
     test_penalty: float = 0.01
 
 
+@dataclass
+class CacheConfig:
+    """On-disk cache settings for LLM outputs."""
+    enabled: bool = True
+    cache_dir: str = "./.docagent_cache"
+
+
 @dataclass
 class DocGenConfig:
     """Root configuration combining all settings."""
@@ -100,6 +113,7 @@ class DocGenConfig:
     embedding: EmbeddingConfig = field(default_factory=EmbeddingConfig)
     qdrant: QdrantConfig = field(default_factory=QdrantConfig)
     rag: RAGConfig = field(default_factory=RAGConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
 
     @classmethod
     def from_env(cls) -> "DocGenConfig":
@@ -110,6 +124,9 @@ class DocGenConfig:
                 chat_model=os.environ.get("DEEPSEEK_CHAT_MODEL", "deepseek-chat"),
                 reasoner_model=os.environ.get("DEEPSEEK_REASONER_MODEL", "deepseek-reasoner"),
                 temperature=float(os.environ.get("LLM_TEMPERATURE", "0.7")),
+                scc_context_tokens=int(os.environ.get("SCC_CONTEXT_TOKENS", "15000")),
+                scc_batch_cycle_tokens=int(os.environ.get("SCC_BATCH_CYCLE_TOKENS", "4000")),
+                scc_batch_tokens=int(os.environ.get("SCC_BATCH_TOKENS", "20000")),
             ),
             processing=ProcessingConfig(
                 max_concurrent_tasks=int(os.environ.get("MAX_CONCURRENT_TASKS", "20")),
@@ -118,6 +135,9 @@ class DocGenConfig:
                 review_timeout=int(os.environ.get("REVIEW_TIMEOUT", "60")),
                 max_plan_retries=int(os.environ.get("MAX_PLAN_RETRIES", "2")),
                 scc_max_retries=int(os.environ.get("SCC_MAX_RETRIES", "3")),
+                max_backoff=float(os.environ.get("MAX_BACKOFF", "60")),
+                speculative_replan=os.environ.get("SPECULATIVE_REPLAN", "false").lower() == "true",
+                dag_scheduling=os.environ.get("DAG_SCHEDULING", "false").lower() == "true",
             ),
             generation=GenerationConfig(
                 use_reasoner=os.environ.get("USE_REASONER", "true").lower() == "true",
@@ -152,6 +172,10 @@ class DocGenConfig:
                 same_file_boost=float(os.environ.get("SAME_FILE_BOOST", "2.0")),
                 test_penalty=float(os.environ.get("TEST_PENALTY", "0.01")),
             ),
+            cache=CacheConfig(
+                enabled=os.environ.get("CACHE_ENABLED", "true").lower() == "true",
+                cache_dir=os.environ.get("CACHE_DIR", "./.docagent_cache"),
+            ),
         )
 
 
@@ -0,0 +1,88 @@
+"""Content-addressed on-disk cache for LLM call results."""
+
+import asyncio
+import hashlib
+import json
+import os
+from typing import Any, Awaitable, Callable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from config import CacheConfig
+
+# Bump when a prompt template changes so stale responses are not reused
+PROMPT_VERSION = "v1"
+
+
+def cache_key(key_parts: tuple) -> str:
+    """Hash the inputs that fully determine an LLM call."""
+    return hashlib.blake2b(
+        json.dumps(key_parts, sort_keys=True, ensure_ascii=False).encode("utf-8"),
+        digest_size=20
+    ).hexdigest()
+
+
+def _cache_path(key: str, cache_config: "CacheConfig") -> str:
+    # Sharded like git objects so no directory grows too large
+    return os.path.join(cache_config.cache_dir, "llm", key[:2], f"{key[2:]}.json")
+
+
+def _read(path: str) -> Optional[Any]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["value"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write(path: str, value: Any) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"value": value}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        pass  # A failed write only costs a future cache miss
+
+
+async def load_cached(key: str, cache_config: "CacheConfig") -> Optional[Any]:
+    """Return the cached value for a key, or None on miss or when caching is disabled."""
+    if not cache_config.enabled:
+        return None
+    return await asyncio.to_thread(_read, _cache_path(key, cache_config))
+
+
+async def store_cached(key: str, value: Any, cache_config: "CacheConfig") -> None:
+    """Persist a JSON-serializable value atomically."""
+    if not cache_config.enabled:
+        return
+    await asyncio.to_thread(_write, _cache_path(key, cache_config), value)
+
+
+async def cached_call(
+    key_parts: tuple,
+    coro_factory: Callable[[], Awaitable[Any]],
+    cache_config: "CacheConfig",
+    cacheable: Optional[Callable[[Any], bool]] = None
+) -> Any:
+    """
+    Return the cached result for key_parts, or run coro_factory() and cache its result.
+
+    Args:
+        key_parts: JSON-serializable inputs of the call (include a retry number to force fresh responses)
+        coro_factory: Creates the coroutine to run on a miss; acquire rate limits inside it
+        cache_config: Cache settings
+        cacheable: Optional predicate; results it rejects (e.g. parse failures) are not stored
+
+    Returns:
+        The cached or freshly computed result
+    """
+    key = cache_key(key_parts)
+    cached = await load_cached(key, cache_config)
+    if cached is not None:
+        return cached
+
+    result = await coro_factory()
+    if result is not None and (cacheable is None or cacheable(result)):
+        await store_cached(key, result, cache_config)
+    return result
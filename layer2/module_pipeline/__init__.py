@@ -1,6 +1,6 @@
 """Layer2 Module Pipeline: Module-level documentation generation and review."""
 
-from layer2.module_pipeline.writer import module_write, scc_context_write
+from layer2.module_pipeline.writer import module_write, scc_context_write, scc_context_write_batch
 from layer2.module_pipeline.reviewer import review
 
-__all__ = ["module_write", "scc_context_write", "review"]
+__all__ = ["module_write", "scc_context_write", "scc_context_write_batch", "review"]
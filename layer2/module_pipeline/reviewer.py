@@ -65,7 +65,7 @@ async def review(state: AgentState, llm_config: "LLMConfig" = None, timeout: int
         docs_to_review=docs_to_review
     )
 
-    start = time.time()
+    start = time.monotonic()
     try:
         response = await asyncio.wait_for(llm.generate_async(prompt), timeout=timeout)
     except asyncio.TimeoutError:
@@ -77,7 +77,7 @@ async def review(state: AgentState, llm_config: "LLMConfig" = None, timeout: int
     except Exception as e:
         state["reviewer_suggestions"] = f"Review failed: {e}"
         state["review_passed"] = False
-        state["last_review_time"] = time.time() - start
+        state["last_review_time"] = time.monotonic() - start
         state["retry_count"] += 1
         return state
 
@@ -86,13 +86,13 @@ async def review(state: AgentState, llm_config: "LLMConfig" = None, timeout: int
     except Exception as e:
         state["reviewer_suggestions"] = f"Failed to parse review response: {e}"
         state["review_passed"] = False
-        state["last_review_time"] = time.time() - start
+        state["last_review_time"] = time.monotonic() - start
         state["retry_count"] += 1
         return state
 
     state["reviewer_suggestions"] = result.get("review_suggestions", "")
     state["review_passed"] = result.get("review_passed", False)
-    state["last_review_time"] = time.time() - start
+    state["last_review_time"] = time.monotonic() - start
     state["retry_count"] += 1
 
     return state
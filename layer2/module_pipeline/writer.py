@@ -10,6 +10,9 @@ if TYPE_CHECKING:
 
 _default_llm = None
 
+# Prefix of SCC overviews whose JSON failed to parse (raw LLM text); these are never cached
+SCC_UNPARSED_PREFIX = "Cycle Architecture Overview:\n"
+
 
 def get_llm(config: "LLMConfig" = None) -> LLMProvider:
     """Get LLM provider instance, optionally with custom config."""
@@ -159,4 +162,40 @@ async def scc_context_write(scc_modules: list, code_chunks_dict: dict, llm_confi
         return format_scc_context(scc_data)
     except ValueError as e:
         print(f"⚠️ Failed to parse SCC overview: {e}")
-        return f"Cycle Architecture Overview:\n{response}\n"
+        return f"{SCC_UNPARSED_PREFIX}{response}\n"
+
+
+# Delimiter between per-cycle JSON objects in a batched SCC overview response
+SCC_BOUNDARY = "<<<SCC_BOUNDARY>>>"
+
+
+async def scc_context_write_batch(scc_modules_list: list, code_chunks_dicts: list, llm_config: "LLMConfig" = None) -> list:
+    """
+    Generate coherence documentation for several small cycles (SCCs) in one LLM call.
+
+    Args:
+        scc_modules_list: Module lists, one per cycle
+        code_chunks_dicts: Per-cycle dicts mapping module names to their source code
+        llm_config: Optional LLM configuration
+
+    Returns:
+        Formatted SCC context markdown per cycle, in input order
+
+    Raises:
+        ValueError: If the response does not contain one overview per cycle
+    """
+    llm = get_llm(llm_config)
+    response = await llm.generate_scc_overview_batch_async(scc_modules_list, code_chunks_dicts, SCC_BOUNDARY)
+    parts = [part.strip() for part in response.split(SCC_BOUNDARY)]
+    parts = [part for part in parts if part]
+    if len(parts) != len(scc_modules_list):
+        raise ValueError(f"Expected {len(scc_modules_list)} SCC overviews, got {len(parts)}")
+
+    contexts = []
+    for part in parts:
+        try:
+            contexts.append(format_scc_context(parse_doc_json(part)))
+        except ValueError as e:
+            print(f"⚠️ Failed to parse batched SCC overview: {e}")
+            contexts.append(f"{SCC_UNPARSED_PREFIX}{part}\n")
+    return contexts
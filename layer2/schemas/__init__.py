@@ -1,6 +1,6 @@
 """Layer2 Schemas: Data models for documentation pipeline."""
 
-from layer2.schemas.agent_state import AgentState
+from layer2.schemas.agent_state import AgentState, RetrieveRequest
 from layer2.schemas.documentation import DocumentationPlan, DocumentationSection
 
-__all__ = ["AgentState", "DocumentationPlan", "DocumentationSection"]
+__all__ = ["AgentState", "RetrieveRequest", "DocumentationPlan", "DocumentationSection"]
@@ -1,4 +1,5 @@
-from typing import TypedDict, List, Optional
+from dataclasses import dataclass, field
+from typing import TypedDict, List, Optional, Sequence
 
 class AgentState(TypedDict):
     # which file we are documenting
@@ -10,8 +11,8 @@ class AgentState(TypedDict):
     # retrieved raw code chunks (from vector DB in real version)
     code_chunks: List[str]
 
-    # dependency docs (loaded markdown summaries)
-    dependency_docs: List[str]
+    # dependency docs (loaded markdown summaries); may be a tuple shared across modules
+    dependency_docs: Sequence[str]
 
     # generated documentation draft
     draft_doc: Optional[str]
@@ -35,3 +36,11 @@ class AgentState(TypedDict):
 
     # Whether this module is part of a cycle (SCC size > 1)
     is_cyclic: bool
+
+
+@dataclass(slots=True)
+class RetrieveRequest:
+    """Lean retrieval input for callers that only need code chunks (e.g. SCC context)."""
+    file: str
+    root_path: str
+    code_chunks: List[str] = field(default_factory=list)
@@ -1,10 +1,42 @@
 from pathlib import Path
 import ast
-from typing import List
-from layer2.schemas.agent_state import AgentState
+import mmap
+import os
+from typing import Dict, List, Optional, Tuple, Union
+from layer2.schemas.agent_state import AgentState, RetrieveRequest
 from layer1.parser import ImportGraph
 
 
+_MMAP_THRESHOLD = 64 * 1024
+
+# path -> (st_ino, st_mtime_ns, source); re-read only when the file changes on disk
+_source_cache: Dict[str, Tuple[int, int, str]] = {}
+
+
+def _read_cached(path: Path) -> Optional[str]:
+    """Read a source file, reusing the cached text while its inode and mtime are unchanged."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    key = str(path)
+    cached = _source_cache.get(key)
+    if cached is not None and cached[0] == st.st_ino and cached[1] == st.st_mtime_ns:
+        return cached[2]
+
+    with open(path, "rb") as f:
+        if st.st_size > _MMAP_THRESHOLD:
+            # Large files are decoded straight from the page cache instead of an extra read buffer
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                source = str(mm, "utf-8")
+        else:
+            source = f.read().decode("utf-8")
+    # Binary reads skip universal newlines; normalize as text-mode open() would
+    source = source.replace("\r\n", "\n").replace("\r", "\n")
+
+    _source_cache[key] = (st.st_ino, st.st_mtime_ns, source)
+    return source
 
 
 def name_to_path(name: str, root_path: Path) -> Path:
@@ -14,36 +46,40 @@ def name_to_path(name: str, root_path: Path) -> Path:
 
 
 
-def retrieve(state: AgentState) -> AgentState:
+def retrieve(state: Union[AgentState, RetrieveRequest]) -> Union[AgentState, RetrieveRequest]:
     """
     Retrieves code chunks from a file using the parser's folder structure.
+
+    Accepts a full AgentState or a lean RetrieveRequest; code_chunks is filled in on either.
     """
-    # print("🔍 Retriever running")
+    if isinstance(state, RetrieveRequest):
+        state.code_chunks = _retrieve_chunks(state.file, state.root_path)
+        return state
 
-    module_name = state["file"]
-    root_path = state["ROOT_PATH"]
+    state["code_chunks"] = _retrieve_chunks(state["file"], state["ROOT_PATH"])
+    return state
 
 
+def _retrieve_chunks(module_name: str, root_path: str) -> List[str]:
+    """Read a module and split it into top-level function/class chunks."""
+    # print("🔍 Retriever running")
 
     # Look up the file path
     file_path = name_to_path(module_name, Path(root_path))
 
-    if not file_path or not file_path.exists():
-        print(f"⚠️ File not found for module: {module_name}")
-        state["code_chunks"] = []
-        return state
-
     # print(f"📄 Reading file: {file_path}")
 
-    source = file_path.read_text(encoding="utf-8")
+    source = _read_cached(file_path)
+    if source is None:
+        print(f"⚠️ File not found for module: {module_name}")
+        return []
 
     # Parse AST
     try:
         tree = ast.parse(source)
     except SyntaxError as e:
         print(f"❌ Syntax error in {file_path}: {e}")
-        state["code_chunks"] = [source]
-        return state
+        return [source]
 
     chunks: List[str] = []
 
@@ -64,8 +100,6 @@ def retrieve(state: AgentState) -> AgentState:
     if not chunks:
         chunks.append(source)
 
-    state["code_chunks"] = chunks
-
     # print(f"✅ Retrieved {len(chunks)} code chunks from {module_name}")
 
-    return state
+    return chunks
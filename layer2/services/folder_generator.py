@@ -1,11 +1,12 @@
 """Folder-level documentation generation service."""
 
 from layer2.services.llm_provider import LLMProvider
+from layer2.llm_cache import PROMPT_VERSION, cached_call
 from typing import TYPE_CHECKING
 import asyncio
 
 if TYPE_CHECKING:
-    from config import LLMConfig
+    from config import CacheConfig, LLMConfig
 
 _default_llm = None
 
@@ -20,7 +21,8 @@ def get_llm(config: "LLMConfig" = None) -> LLMProvider:
     return _default_llm
 
 
-async def generate_folder_docs_async(analyzer, final_docs: dict, semaphore: asyncio.Semaphore, llm_config: "LLMConfig" = None) -> tuple:
+async def generate_folder_docs_async(analyzer, final_docs: dict, semaphore: asyncio.Semaphore, llm_config: "LLMConfig" = None,
+                                     cache_config: "CacheConfig" = None) -> tuple:
     """
     Generate folder-level documentation from module docs (async version).
 
@@ -31,6 +33,9 @@ async def generate_folder_docs_async(analyzer, final_docs: dict, semaphore: asyn
         analyzer: ImportGraph analyzer with codebase structure
         final_docs: Dict mapping module names to their documentation
         semaphore: Semaphore for rate limiting LLM calls
+        llm_config: Optional LLM configuration
+        cache_config: Optional cache settings; when given, folder descriptions are reused
+            across runs while their prompt is unchanged
 
     Returns:
         (folder_docs, folder_tree) - docs dict and hierarchical tree structure
@@ -94,9 +99,17 @@ async def generate_folder_docs_async(analyzer, final_docs: dict, semaphore: asyn
                 child_folder_descriptions
             )
 
-            # Use semaphore to respect MAX_CONCURRENT_TASKS
-            async with semaphore:
-                description = await llm.generate_async(prompt)
+            async def generate() -> str:
+                # Use semaphore to respect MAX_CONCURRENT_TASKS
+                async with semaphore:
+                    return await llm.generate_async(prompt)
+
+            if cache_config is None:
+                description = await generate()
+            else:
+                description = await cached_call(
+                    ("folder_write", PROMPT_VERSION, llm.chat_model, prompt), generate, cache_config
+                )
 
             return folder_info.folder_path, description, context
 
@@ -299,6 +299,76 @@ Guidelines:
 - The summary should be usable as context for documenting individual modules
 
 Ensure the JSON is well-formed and parsable.
+"""
+        return await self.generate_async(prompt)
+
+    async def generate_scc_overview_batch_async(
+        self,
+        scc_groups: List[List[str]],
+        code_chunks_dicts: List[Dict[str, str]],
+        boundary: str
+    ) -> str:
+        """
+        Generate overviews for several small cycles (SCCs) in one LLM call.
+
+        Args:
+            scc_groups: Module lists, one per cycle
+            code_chunks_dicts: Per-cycle dicts mapping module names to their source code
+            boundary: Delimiter the model must emit between the per-cycle JSON objects
+
+        Returns:
+            Raw response containing one JSON overview per cycle, in input order, separated by boundary
+        """
+        cycle_blocks = []
+        for idx, (scc_modules, code_chunks_dict) in enumerate(zip(scc_groups, code_chunks_dicts), 1):
+            code_context = "\n\n".join([
+                f"=== Module: {mod} ===\n{code_chunks_dict.get(mod, '(source not available)')}"
+                for mod in scc_modules
+            ])
+            cycle_blocks.append(
+                f"### CYCLE {idx}\nMODULES IN CYCLE: {', '.join(scc_modules)}\n\nSOURCE CODE:\n{code_context}"
+            )
+        cycles_context = "\n\n".join(cycle_blocks)
+
+        prompt = f"""
+You are analyzing {len(scc_groups)} independent circular dependency groups in a Python codebase.
+Treat each cycle separately; do not mix modules between cycles.
+
+{cycles_context}
+
+TASK
+====
+For EACH cycle, generate a high-level ARCHITECTURE OVERVIEW that:
+1. Identifies the collective responsibility of the module group
+2. Explains the interdependency pattern (why they depend on each other)
+3. Describes key abstractions or patterns that emerge from the cycle
+4. Notes which modules are "entry points" vs "utilities"
+5. Flags any architectural concerns (tight coupling, unclear boundaries)
+
+OUTPUT FORMAT
+=============
+Return exactly {len(scc_groups)} JSON objects, one per cycle, in the same order as the cycles above.
+Put the line {boundary} between consecutive objects and nothing else outside the objects.
+Each object must have EXACTLY this schema:
+
+{{
+  "cycle_pattern": "Brief name of the dependency pattern (e.g., 'Mutual Registry Pattern')",
+  "collective_responsibility": "What this group does as a whole",
+  "interdependency_explanation": "Why these modules depend on each other",
+  "key_abstractions": ["abstraction1", "abstraction2"],
+  "entry_points": ["module1", "module2"],
+  "utilities": ["module3"],
+  "architectural_concerns": ["concern1", "concern2"] or [],
+  "summary": "2-3 sentence overview that other modules can use for context"
+}}
+
+Guidelines:
+- Be concise but informative
+- Focus on architectural patterns, not implementation details
+- Explain the "why" behind each circular dependency
+- Each summary should be usable as context for documenting individual modules
+
+Ensure every JSON object is well-formed and parsable.
 """
         return await self.generate_async(prompt)
 
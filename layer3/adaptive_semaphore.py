@@ -0,0 +1,87 @@
+"""AIMD concurrency limiter for LLM calls."""
+
+import asyncio
+from collections import deque
+from typing import Deque
+from openai import RateLimitError
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Whether an LLM call failed because the provider is throttling us (HTTP 429)."""
+    return isinstance(exc, RateLimitError) or getattr(exc, "status_code", None) == 429
+
+
+class AdaptiveSemaphore:
+    """
+    Semaphore whose permit count adapts to the provider's observed limits.
+
+    Each success adds one permit (up to max_permits); each rate-limit or
+    context-length error halves them (down to min_permits). Shrinking never
+    revokes permits already held - acquires simply wait until in-flight calls
+    drain below the new limit. Drop-in for asyncio.Semaphore via `async with`.
+    """
+
+    def __init__(self, max_permits: int, min_permits: int = 1):
+        self.max_permits = max(1, max_permits)
+        self.min_permits = max(1, min(min_permits, self.max_permits))
+        self._limit = self.max_permits
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        """Current number of permits."""
+        return self._limit
+
+    def locked(self) -> bool:
+        """Return True if acquire() would have to wait."""
+        return self._in_flight >= self._limit
+
+    async def acquire(self) -> bool:
+        """Wait for a permit under the current limit."""
+        if not self._waiters and self._in_flight < self._limit:
+            self._in_flight += 1
+            return True
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # The permit was already handed over before the cancel landed
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+        return True
+
+    def release(self) -> None:
+        """Return a permit and wake waiters that now fit under the limit."""
+        if self._in_flight <= 0:
+            # Same guard as asyncio.BoundedSemaphore: an extra release is a caller bug
+            raise ValueError("AdaptiveSemaphore released too many times")
+        self._in_flight -= 1
+        self._wake()
+
+    def on_success(self) -> None:
+        """Additive increase: allow one more concurrent call."""
+        if self._limit < self.max_permits:
+            self._limit += 1
+            self._wake()
+
+    def on_error(self) -> None:
+        """Multiplicative decrease: halve the concurrent calls allowed."""
+        self._limit = max(self.min_permits, self._limit // 2)
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self._limit:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                # Hand the permit straight to the waiter so no newcomer can jump ahead
+                self._in_flight += 1
+                fut.set_result(None)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
@@ -1,9 +1,12 @@
 """Simplified async documentation generator - main orchestration only."""
 
 import asyncio
-from typing import Dict, TYPE_CHECKING
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set, TYPE_CHECKING
 from layer1.parser import ImportGraph
 from layer1.parent_child_indexer import ParentChildIndexer
+from layer3.adaptive_semaphore import AdaptiveSemaphore
 from layer3.scc_manager import SCCManager
 from layer3.batch_processor import BatchProcessor
 from layer3.file_output_writer import OutputWriter
@@ -35,22 +38,30 @@ class AsyncDocGenerator:
                     folder_docs_file=config.output.folder_docs_file,
                     scc_contexts_file=config.output.scc_contexts_file,
                     condensed_file=config.output.condensed_file,
-                )
+                ),
+                cache=config.cache,
             )
 
         self.config = config
         self.root_path = root_path
         self.analyzer = None
-        self.semaphore = asyncio.Semaphore(config.processing.max_concurrent_tasks)
+        self.sccs = []
+        self._deps: Dict[str, List[str]] = {}
+        self._in_cycle: Set[str] = set()
+        # One AIMD limiter shared by every LLM caller, so backoff applies across the pipeline
+        self.semaphore = AdaptiveSemaphore(config.processing.max_concurrent_tasks)
 
         # Initialize Parent-Child RAG indexer
         self.parent_child_indexer = ParentChildIndexer(root_path)
 
         # Delegate responsibilities to specialized components (with config)
-        self.scc_manager = SCCManager(root_path, self.semaphore, config)
+        # SCC preparation and module processing share one CPU-sized retrieval pool
+        self.retrieve_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="retrieve")
+        self.scc_manager = SCCManager(root_path, self.semaphore, config, retrieve_pool=self.retrieve_pool)
         self.batch_processor = BatchProcessor(
             root_path, None, self.semaphore, config,
-            parent_indexer=self.parent_child_indexer  # Pass indexer for RAG
+            parent_indexer=self.parent_child_indexer,  # Pass indexer for RAG
+            retrieve_pool=self.retrieve_pool
         )
         self.output_writer = OutputWriter(config)
         self.reporter = ProgressReporter()
@@ -67,7 +78,13 @@ class AsyncDocGenerator:
         # Filter to only actual modules, exclude packages
         self.modules_only = [m for m in self.analyzer.module_index if m not in self.analyzer.packages]
 
-        cycles = [scc for scc in self.analyzer.get_sccs() if len(scc) > 1]
+        # Graph queries are computed once; run() and batching reuse them instead of rebuilding the graph
+        self.sccs = self.analyzer.get_sccs()
+        cycles = [scc for scc in self.sccs if len(scc) > 1]
+        self._deps = {m: self.analyzer.get_dependencies(m) for m in self.analyzer.module_index}
+        self._in_cycle = {m for scc in cycles for m in scc}
+        self.batch_processor.deps = self._deps
+        self.batch_processor.in_cycle = self._in_cycle
         self.reporter.print_analysis_summary(len(self.modules_only), len(self.analyzer.packages), len(cycles))
 
         # Index code chunks for Parent-Child RAG (children)
@@ -96,22 +113,33 @@ class AsyncDocGenerator:
         print(f"📋 Processing {total_modules} modules\n")
         
         # Pre-generate all SCC contexts
-        sccs = self.analyzer.get_sccs()
-        scc_contexts = await self.scc_manager.generate_all_scc_contexts(sccs)
+        await self.scc_manager.generate_all_scc_contexts(self.sccs)
+        self.batch_processor.scc_id_of = self.scc_manager.scc_id_of
+        self.batch_processor.scc_context_by_id = self.scc_manager.scc_context_by_id
         
-        # Export SCC contexts
-        scc_contexts_dict = self.scc_manager.get_all_contexts()
-        if scc_contexts_dict:
-            self.output_writer.write_scc_contexts(scc_contexts_dict)
-        
-        # Organize modules into dependency batches
-        batches = self.batch_processor.organize_batches(sorted_modules)
-        print(f"📋 Organized into {len(batches)} dependency batches\n")
+        # Export SCC contexts in a worker thread, overlapping with module processing
+        scc_contexts_list = self.scc_manager.get_all_contexts()
+        scc_export_task = None
+        if scc_contexts_list:
+            scc_export_task = asyncio.create_task(
+                asyncio.to_thread(self.output_writer.write_scc_contexts, list(scc_contexts_list))
+            )
         
-        # Process all batches
-        for batch_idx, batch in enumerate(batches, 1):
-            await self.batch_processor.process_batch(batch, batch_idx, len(batches), scc_contexts, self.reporter)
+        if self.config.processing.dag_scheduling:
+            # No batch barrier: each module starts as soon as its dependencies are documented
+            await self.batch_processor.process_dag(sorted_modules, self.reporter, self.sccs)
+        else:
+            # Organize modules into dependency batches
+            batches = self.batch_processor.organize_batches(sorted_modules)
+            print(f"📋 Organized into {len(batches)} dependency batches\n")
+            
+            # Process all batches
+            for batch_idx, batch in enumerate(batches, 1):
+                await self.batch_processor.process_batch(batch, batch_idx, len(batches), self.reporter)
         
+        if scc_export_task is not None:
+            await scc_export_task
+
         # Print summary
         final_docs = self.batch_processor.final_docs
         failed_modules = self.batch_processor.failed_modules
@@ -119,29 +147,40 @@ class AsyncDocGenerator:
         
         return final_docs
     
+    def close(self) -> None:
+        """Release worker pools; call once all outputs are written."""
+        self.scc_manager.close()
+        self.retrieve_pool.shutdown(wait=True)
+
     async def write_all_outputs(self, final_docs: Dict[str, str]) -> None:
         """Write all output files (async version)."""
         if not final_docs or not self.analyzer:
             return
 
-        # Module-level docs (sync is fine)
-        self.output_writer.write_module_docs(final_docs)
-
-        # Folder-level docs (now async, parallel per level, bottom-up)
-        folder_docs, folder_tree = await self.output_writer.write_folder_docs(
-            self.analyzer,
-            final_docs,
-            self.semaphore  # Pass existing semaphore
+        # Module-level docs and the dependency log are plain file writes; run them in threads
+        # while the folder and condensed docs wait on the LLM
+        module_docs_task = asyncio.create_task(
+            asyncio.to_thread(self.output_writer.write_module_docs, final_docs)
         )
-
-        # Condensed documentation (now with planner agent)
-        await self.output_writer.write_condensed_doc_with_planner(
-            self.analyzer,
-            final_docs,
-            folder_docs,
-            folder_tree,  # Pass hierarchical structure
-            self.semaphore
+        dependency_usage_task = asyncio.create_task(
+            asyncio.to_thread(self.output_writer.write_dependency_usage, self.batch_processor.dependency_usage_log)
         )
 
-        # Dependency usage log (sync is fine)
-        self.output_writer.write_dependency_usage(self.batch_processor.dependency_usage_log)
\ No newline at end of file
+        try:
+            # Folder-level docs (now async, parallel per level, bottom-up)
+            folder_docs, folder_tree = await self.output_writer.write_folder_docs(
+                self.analyzer,
+                final_docs,
+                self.semaphore  # Pass existing semaphore
+            )
+
+            # Condensed documentation (now with planner agent)
+            await self.output_writer.write_condensed_doc_with_planner(
+                self.analyzer,
+                final_docs,
+                folder_docs,
+                folder_tree,  # Pass hierarchical structure
+                self.semaphore
+            )
+        finally:
+            await asyncio.gather(module_docs_task, dependency_usage_task)
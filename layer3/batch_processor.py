@@ -3,24 +3,92 @@
 import asyncio
 import time
 import json
-from typing import List, Dict, Optional, Set, TYPE_CHECKING
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, FrozenSet, Optional, Sequence, Set, Tuple, TYPE_CHECKING
 from tqdm import tqdm
 from layer2.schemas.agent_state import AgentState
 from layer2.services.code_retriever import retrieve
 from layer2.module_pipeline.writer import module_write
 from layer2.module_pipeline.reviewer import review
+from layer2.llm_cache import PROMPT_VERSION, cached_call
+from layer3.adaptive_semaphore import AdaptiveSemaphore, is_rate_limit_error
 from layer3.progress_reporter import ProgressReporter
 
 if TYPE_CHECKING:
     from config import DocGenConfig
     from layer1.parent_child_indexer import ParentChildIndexer
 
+# Last formatted schedule timestamp, keyed by epoch second
+_stamp_cache = [0, ""]
+
+
+def _now_stamp() -> str:
+    """Return the local '%Y-%m-%d %H:%M:%S' timestamp, reformatted once per second."""
+    now = int(time.time())
+    if now != _stamp_cache[0]:
+        _stamp_cache[0] = now
+        _stamp_cache[1] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+    return _stamp_cache[1]
+
+
+class _BufferedProgress:
+    """tqdm wrapper that batches status lines so the terminal is written every few completions."""
+
+    def __init__(self, pbar: tqdm, max_lines: int = 16, max_delay: float = 0.2):
+        self.pbar = pbar
+        self.max_lines = max_lines
+        self.max_delay = max_delay
+        self._lines: List[str] = []
+        self._last_flush = time.monotonic()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def update(self, n: int = 1) -> None:
+        self.pbar.update(n)
+
+    def write(self, line: str) -> None:
+        self._lines.append(line)
+        if len(self._lines) >= self.max_lines or time.monotonic() - self._last_flush > self.max_delay:
+            self.flush()
+        elif self._timer is None:
+            # Don't hold the tail of a burst until the next completion
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self.flush)
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._lines:
+            self.pbar.write("\n".join(self._lines))
+            self._lines.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+        self.pbar.close()
+
 
 class BatchProcessor:
     """Handles batch processing of modules with parallel execution."""
 
-    def __init__(self, root_path: str, analyzer, semaphore: asyncio.Semaphore,
-                 config: "DocGenConfig" = None, parent_indexer: "ParentChildIndexer" = None):
+    # Defaults for every module's AgentState; per-module and mutable fields are always overwritten
+    _STATE_TEMPLATE: AgentState = {
+        "file": "",
+        "dependencies": [],
+        "code_chunks": [],
+        "dependency_docs": (),
+        "draft_doc": None,
+        "review_passed": False,
+        "reviewer_suggestions": "",
+        "retry_count": 0,
+        "ROOT_PATH": "",
+        "scc_context": None,
+        "is_cyclic": False,
+    }
+
+    def __init__(self, root_path: str, analyzer, semaphore: AdaptiveSemaphore,
+                 config: "DocGenConfig" = None, parent_indexer: "ParentChildIndexer" = None,
+                 *, retrieve_pool: ThreadPoolExecutor):
         # Load config if not provided
         if config is None:
             from config import DocGenConfig
@@ -30,36 +98,55 @@ class BatchProcessor:
         self.root_path = root_path
         self.analyzer = analyzer
         self.semaphore = semaphore
+        # Only mutated from the event-loop thread between awaits, so no lock is needed
         self.final_docs: Dict[str, str] = {}
-        self.final_docs_lock = asyncio.Lock()
         self.failed_modules: List[tuple] = []
         self.dependency_usage_log: Dict = {}
+        # Documented-dependency key -> shared docs tuple; safe since final_docs entries are never replaced
+        self._dependency_docs_cache: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
         self.parent_indexer = parent_indexer  # For RAG indexing
+        # Retrieval (disk + AST) gets its own CPU-sized pool so it never queues behind other to_thread work;
+        # the caller owns the pool and shuts it down
+        self._retrieve_pool = retrieve_pool
+        # Precomputed graph queries, filled in by the generator after analysis
+        self.deps: Dict[str, List[str]] = {}
+        self.in_cycle: Optional[Set[str]] = None
+        # Cycle contexts by id, filled in by the generator after SCC generation
+        self.scc_id_of: Dict[str, int] = {}
+        self.scc_context_by_id: Dict[int, str] = {}
+
+    def _get_dependencies(self, module: str) -> List[str]:
+        """Direct dependencies of a module, from the precomputed map when available."""
+        deps = self.deps.get(module)
+        return deps if deps is not None else self.analyzer.get_dependencies(module)
+
+    def _is_in_cycle(self, module: str) -> bool:
+        """Whether a module is part of a cycle, from the precomputed set when available."""
+        if self.in_cycle is not None:
+            return module in self.in_cycle
+        return self.analyzer.is_in_cycle(module)
     
     async def process_module(self, module: str, dependencies: List[str], 
-                            dependency_docs: List[str], scc_context: Optional[str],
+                            dependency_docs: Sequence[str], scc_context: Optional[str],
                             is_cyclic: bool, dependency_doc_sources: Dict[str, bool] = None) -> tuple:
         """Process a single module: retrieve -> write -> review."""
         
         try:
-            # Initial state
-            state: AgentState = {
-                "file": module,
-                "dependencies": dependencies,
-                "code_chunks": [],
-                "dependency_docs": dependency_docs,
-                "draft_doc": None,
-                "review_passed": False,
-                "reviewer_suggestions": "",
-                "retry_count": 0,
-                "ROOT_PATH": self.root_path,
-                "scc_context": scc_context,
-                "is_cyclic": is_cyclic,
-            }
+            # Initial state: copy the shared defaults, then fill in this module's fields
+            state: AgentState = self._STATE_TEMPLATE.copy()
+            state.update(
+                file=module,
+                dependencies=dependencies,
+                code_chunks=[],
+                dependency_docs=dependency_docs,
+                ROOT_PATH=self.root_path,
+                scc_context=scc_context,
+                is_cyclic=is_cyclic,
+            )
 
             # Log dependency usage
             self.dependency_usage_log[module] = {
-                "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
+                "timestamp": _now_stamp(),
                 "dependencies": dependency_doc_sources if dependency_doc_sources else {dep: dep in self.final_docs for dep in dependencies}
             }
             
@@ -70,47 +157,38 @@ class BatchProcessor:
             llm_config = self.config.llm
 
             # Retrieve code chunks
-            retrieve_start = time.time()
+            retrieve_start = time.monotonic()
             try:
-                state = await asyncio.wait_for(asyncio.to_thread(retrieve, state), timeout=retrieve_timeout)
-                state["last_retrieve_time"] = time.time() - retrieve_start
+                loop = asyncio.get_running_loop()
+                state = await asyncio.wait_for(
+                    loop.run_in_executor(self._retrieve_pool, retrieve, state), timeout=retrieve_timeout
+                )
+                state["last_retrieve_time"] = time.monotonic() - retrieve_start
             except asyncio.TimeoutError:
                 return (module, None, False, f"Retrieve timed out after {retrieve_timeout}s", {"retrieve": None, "write": None, "review": None})
             except Exception as e:
                 return (module, None, False, f"Retrieve failed: {e}", {"retrieve": None, "write": None, "review": None})
 
-            # Write documentation
-            write_start = time.time()
-            try:
-                async with self.semaphore:
-                    state = await module_write(state, llm_config=llm_config)
-                state["last_write_time"] = time.time() - write_start
-            except Exception as e:
-                return (module, None, False, f"Write failed: {e}", {"retrieve": state.get("last_retrieve_time"), "write": None, "review": None})
-
-            # Review documentation (skip if max_retries is 0)
-            if max_retries > 0:
+            # Write then review; rewrite with the reviewer's suggestions until it passes or retries run out
+            for attempt in range(max_retries + 1):
+                retry = " retry" if attempt else ""
+                state["retry_count"] = attempt
+                write_start = time.monotonic()
                 try:
-                    state = await review(state, llm_config=llm_config, timeout=review_timeout)
+                    state = await self._write_cached(state, llm_config)
+                    state["last_write_time"] = time.monotonic() - write_start
                 except Exception as e:
-                    return (module, None, False, f"Review failed: {e}", {"retrieve": state.get("last_retrieve_time"), "write": state.get("last_write_time"), "review": None})
-
-            # Retry if needed
-            retry_count = 0
-            while max_retries > 0 and not state["review_passed"] and retry_count < max_retries:
-                retry_count += 1
-                state["retry_count"] = retry_count
-                write_start = time.time()
-                try:
-                    async with self.semaphore:
-                        state = await module_write(state, llm_config=llm_config)
-                    state["last_write_time"] = time.time() - write_start
-                except Exception as e:
-                    return (module, None, False, f"Write retry failed: {e}", {"retrieve": state.get("last_retrieve_time"), "write": None, "review": None})
+                    return (module, None, False, f"Write{retry} failed: {e}", {"retrieve": state.get("last_retrieve_time"), "write": None, "review": None})
+
+                # Review documentation (skip if max_retries is 0)
+                if max_retries == 0:
+                    break
                 try:
-                    state = await review(state, llm_config=llm_config, timeout=review_timeout)
+                    state = await self._review_cached(state, llm_config, review_timeout)
                 except Exception as e:
-                    return (module, None, False, f"Review retry failed: {e}", {"retrieve": state.get("last_retrieve_time"), "write": state.get("last_write_time"), "review": None})
+                    return (module, None, False, f"Review{retry} failed: {e}", {"retrieve": state.get("last_retrieve_time"), "write": state.get("last_write_time"), "review": None})
+                if state["review_passed"]:
+                    break
 
             # Index to parent collection for RAG if indexer is available
             if self.parent_indexer and state.get("doc_data"):
@@ -131,100 +209,239 @@ class BatchProcessor:
         except Exception as e:
             return (module, None, False, str(e), {"retrieve": state.get("last_retrieve_time") if 'state' in locals() else None, "write": state.get("last_write_time") if 'state' in locals() else None, "review": state.get("last_review_time") if 'state' in locals() else None})
     
+    async def _write_cached(self, state: AgentState, llm_config) -> AgentState:
+        """Run module_write through the on-disk LLM cache; the semaphore is only taken on a miss."""
+        async def generate() -> dict:
+            # module_write only sets doc_data when the draft parses; clear the previous attempt's
+            # value so an unparsed retry isn't cached (or indexed) with stale structured data
+            state["doc_data"] = None
+            async with self.semaphore:
+                try:
+                    written = await module_write(state, llm_config=llm_config)
+                except Exception as e:
+                    if is_rate_limit_error(e):
+                        self.semaphore.on_error()
+                    raise
+            self.semaphore.on_success()
+            return {"draft_doc": written["draft_doc"], "doc_data": written.get("doc_data")}
+
+        key_parts = (
+            "module_write", PROMPT_VERSION, llm_config.chat_model, state["file"], state["dependencies"],
+            state["code_chunks"], state["dependency_docs"], state.get("scc_context"),
+            state["reviewer_suggestions"], state["retry_count"],
+        )
+        # Unparsed fallback drafts are not cached so the next run tries again
+        result = await cached_call(key_parts, generate, self.config.cache,
+                                   cacheable=lambda r: r["doc_data"] is not None)
+        state["draft_doc"] = result["draft_doc"]
+        state["doc_data"] = result["doc_data"]
+        return state
+
+    async def _review_cached(self, state: AgentState, llm_config, timeout: int) -> AgentState:
+        """Run review through the on-disk LLM cache, reusing only passing verdicts."""
+        reviewed: Optional[AgentState] = None  # Set only on a cache miss
+
+        async def generate() -> dict:
+            nonlocal reviewed
+            reviewed = await review(state, llm_config=llm_config, timeout=timeout)
+            return {"review_passed": reviewed["review_passed"], "reviewer_suggestions": reviewed["reviewer_suggestions"]}
+
+        key_parts = (
+            "review", PROMPT_VERSION, llm_config.chat_model, state["file"], state["dependencies"],
+            state["code_chunks"], state["dependency_docs"], state["draft_doc"],
+        )
+        # Failed, timed-out and rejecting reviews are rerun; a pass is stable for identical inputs
+        result = await cached_call(key_parts, generate, self.config.cache,
+                                   cacheable=lambda r: r["review_passed"])
+        if reviewed is not None:
+            # Cache miss: review() already applied its verdict
+            return reviewed
+
+        # Cache hit: apply the verdict the way review() would have
+        state["review_passed"] = result["review_passed"]
+        state["reviewer_suggestions"] = result["reviewer_suggestions"]
+        state["last_review_time"] = 0.0
+        state["retry_count"] += 1
+        return state
+
+    def _module_coro(self, module: str, exclude: FrozenSet[str] = frozenset()):
+        """
+        Build a module's inputs from the docs finished so far and return its process_module coroutine.
+
+        Dependencies in `exclude` are never passed as docs, even if already documented.
+        """
+        is_cyclic = self._is_in_cycle(module)
+        dependencies = self._get_dependencies(module)
+
+        # Gather dependency docs (should all be ready); modules with the same documented deps share one tuple
+        present = tuple(d for d in dependencies if d in self.final_docs and d not in exclude)
+        dependency_docs = self._dependency_docs_cache.get(present)
+        if dependency_docs is None:
+            dependency_docs = tuple(self.final_docs[d] for d in present)
+            self._dependency_docs_cache[present] = dependency_docs
+
+        scc_context = self.scc_context_by_id.get(self.scc_id_of.get(module))
+        dependency_doc_sources = {d: (d in self.final_docs and d not in exclude) for d in dependencies}
+
+        return self.process_module(
+            module=module,
+            dependencies=dependencies,
+            dependency_docs=dependency_docs,
+            scc_context=scc_context,
+            is_cyclic=is_cyclic,
+            dependency_doc_sources=dependency_doc_sources
+        )
+
+    def _record_result(self, result: tuple, reporter: ProgressReporter, pbar: _BufferedProgress) -> bool:
+        """Store one module's outcome and report it on the progress bar; returns True on success."""
+        module, doc, success, error, timings = result
+        timing_str = reporter.format_timings(timings)
+
+        if success and doc:
+            self.final_docs[module] = doc
+            pbar.update(1)
+            pbar.write(f"    ✓ {module}{timing_str}")
+            return True
+
+        self.failed_modules.append((module, error or "Unknown error", 0, timings))
+        pbar.update(1)
+        pbar.write(f"    ✗ {module}: {error[:50] if error else 'Unknown error'}{timing_str}")
+        return False
+
     async def process_batch(self, modules_to_process: List[str], batch_num: int, total_batches: int,
-                           scc_contexts: Dict[str, str], reporter: ProgressReporter) -> None:
+                           reporter: ProgressReporter) -> None:
         """Process a batch of modules in parallel with progress bar."""
         
         reporter.print_batch_header(batch_num, total_batches, len(modules_to_process))
         
         # Create progress bar for this batch
-        pbar = tqdm(total=len(modules_to_process), desc=f"  Batch {batch_num}", 
-                   unit="module", ncols=80, leave=False, colour="blue")
+        pbar = _BufferedProgress(tqdm(total=len(modules_to_process), desc=f"  Batch {batch_num}", 
+                                      unit="module", ncols=80, leave=False, colour="blue"))
         
-        # Prepare all tasks
-        tasks = {}
-        skipped_packages = 0
-        for module in modules_to_process:
-            # Skip packages - they don't have corresponding .py files
-            if module in self.analyzer.packages:
-                skipped_packages += 1
-                continue
-            
-            is_cyclic = self.analyzer.is_in_cycle(module)
-            dependencies = self.analyzer.get_dependencies(module)
-            
-            # Gather dependency docs (should all be ready)
-            dependency_docs = [
-                self.final_docs[d] for d in dependencies 
-                if d in self.final_docs
-            ]
-            
-            scc_context = scc_contexts.get(module, None)
-            dependency_doc_sources = {d: (d in self.final_docs) for d in dependencies}
-
-            task = self.process_module(
-                module=module,
-                dependencies=dependencies,
-                dependency_docs=dependency_docs,
-                scc_context=scc_context,
-                is_cyclic=is_cyclic,
-                dependency_doc_sources=dependency_doc_sources
-            )
-            tasks[task] = module
+        # Start all tasks up front; packages are skipped since they don't have corresponding .py files
+        tasks = [
+            asyncio.create_task(self._module_coro(module), name=module)
+            for module in modules_to_process
+            if module not in self.analyzer.packages
+        ]
+        skipped_packages = len(modules_to_process) - len(tasks)
         
         # Run all tasks concurrently with progress tracking
         success_count = 0
-        for task in asyncio.as_completed(tasks.keys()):
-            try:
-                module, doc, success, error, timings = await task
-                timing_str = reporter.format_timings(timings)
-
-                if success and doc:
-                    async with self.final_docs_lock:
-                        self.final_docs[module] = doc
-                    success_count += 1
-                    pbar.update(1)
-                    pbar.write(f"    ✓ {module}{timing_str}")
-                else:
-                    self.failed_modules.append((module, error or "Unknown error", 0, timings))
+        try:
+            for task in asyncio.as_completed(tasks):
+                try:
+                    if self._record_result(await task, reporter, pbar):
+                        success_count += 1
+                except Exception as e:
                     pbar.update(1)
-                    pbar.write(f"    ✗ {module}: {error[:50] if error else 'Unknown error'}{timing_str}")
-            except Exception as e:
-                pbar.update(1)
-                pbar.write(f"    ✗ Task error: {str(e)[:50]}")
+                    pbar.write(f"    ✗ Task error: {str(e)[:50]}")
+        finally:
+            # Don't leave siblings running if this batch is cancelled
+            for task in tasks:
+                task.cancel()
+            pbar.close()
         
-        pbar.close()
         actual_processed = len(modules_to_process) - skipped_packages
         reporter.print_batch_complete(success_count, actual_processed, skipped_packages)
+
+    async def process_dag(self, sorted_modules: List[str], reporter: ProgressReporter,
+                          sccs: List[Set[str]]) -> None:
+        """Process each module as soon as its local dependencies finish, with no per-batch barrier."""
+        modules = [m for m in sorted_modules if m not in self.analyzer.packages]
+        module_set = set(modules)
+        scc_of = {m: idx for idx, scc in enumerate(sccs) if len(scc) > 1 for m in scc}
+        # Cycle siblings finish in timing-dependent order, so their docs are never used as inputs;
+        # this keeps prompts (and LLM cache keys) deterministic, as in the batch path
+        cycle_members = {m: frozenset(scc) for scc in sccs if len(scc) > 1 for m in scc}
+
+        # Edges inside a cycle are dropped so the graph is a DAG; cycle members lean on their SCC context
+        in_degree: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        for module in modules:
+            cycle = scc_of.get(module)
+            local_deps = {
+                d for d in self._get_dependencies(module)
+                if d in module_set and d != module and (cycle is None or scc_of.get(d) != cycle)
+            }
+            in_degree[module] = len(local_deps)
+            for d in local_deps:
+                dependents[d].append(module)
+
+        reporter.print_dag_header(len(modules))
+        pbar = _BufferedProgress(tqdm(total=len(modules), desc="  Modules",
+                                      unit="module", ncols=80, leave=False, colour="blue"))
+
+        running: Dict[asyncio.Task, str] = {}
+
+        def launch(module: str) -> None:
+            coro = self._module_coro(module, cycle_members.get(module, frozenset()))
+            running[asyncio.create_task(coro, name=module)] = module
+
+        for module in modules:
+            if in_degree[module] == 0:
+                launch(module)
+
+        success_count = 0
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    module = running.pop(task)
+                    try:
+                        if self._record_result(task.result(), reporter, pbar):
+                            success_count += 1
+                    except Exception as e:
+                        pbar.update(1)
+                        pbar.write(f"    ✗ Task error: {str(e)[:50]}")
+
+                    # Dependents start once every local dependency has finished, successful or not
+                    for dependent in dependents[module]:
+                        in_degree[dependent] -= 1
+                        if in_degree[dependent] == 0:
+                            launch(dependent)
+        finally:
+            # Don't leave modules running if the scheduler is cancelled or raises
+            for task in running:
+                task.cancel()
+            pbar.close()
+
+        reporter.print_batch_complete(success_count, len(modules), 0)
     
     def organize_batches(self, sorted_modules: List[str]) -> List[List[str]]:
-        """Organize modules into batches by dependency depth."""
+        """Organize modules into batches by dependency depth (Kahn-style layering)."""
         batches = []
-        processed = set()
-        total_modules = len(sorted_modules)
-        max_iterations = total_modules  # Safety check
-        
-        while len(processed) < total_modules and max_iterations > 0:
-            max_iterations -= 1
-            # Find all modules whose LOCAL dependencies are satisfied
-            available = []
-            for module in sorted_modules:
-                if module in processed:
-                    continue
-                deps = self.analyzer.get_dependencies(module)
-                # Check if all dependencies that are in this codebase are already processed
-                local_deps = [d for d in deps if d in self.analyzer.module_index and d not in self.analyzer.packages]
-                if all(d in processed for d in local_deps):
-                    available.append(module)
-            
-            if not available:
-                # Fallback: add all remaining unprocessed modules
-                available = [m for m in sorted_modules if m not in processed]
-                if available:
-                    print(f"  ℹ️  Note: Processing {len(available)} remaining modules with potential external deps")
-            
-            if available:
-                batches.append(available)
-                processed.update(available)
-        
-        return batches
\ No newline at end of file
+        position = {m: i for i, m in enumerate(sorted_modules)}
+
+        # Count each module's LOCAL dependencies and index dependents for O(1) release
+        in_degree: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        for module in sorted_modules:
+            local_deps = [d for d in self._get_dependencies(module)
+                          if d in self.analyzer.module_index and d not in self.analyzer.packages]
+            in_degree[module] = len(local_deps)
+            for d in local_deps:
+                dependents[d].append(module)
+
+        available = [m for m in sorted_modules if in_degree[m] == 0]
+        remaining = len(sorted_modules)
+        while available:
+            batches.append(available)
+            remaining -= len(available)
+            next_layer = []
+            for module in available:
+                for dependent in dependents[module]:
+                    in_degree[dependent] -= 1
+                    if in_degree[dependent] == 0:
+                        next_layer.append(dependent)
+            # Keep each batch in dependency-sorted order
+            next_layer.sort(key=position.__getitem__)
+            available = next_layer
+
+        if remaining:
+            # Fallback: add all remaining unprocessed modules (cycles or deps outside this run)
+            leftover = [m for m in sorted_modules if in_degree[m] > 0]
+            print(f"  ℹ️  Note: Processing {len(leftover)} remaining modules with potential external deps")
+            batches.append(leftover)
+
+        return batches
@@ -2,12 +2,43 @@
 
 import os
 import asyncio
-from typing import Dict, TYPE_CHECKING
+import hashlib
+import json
+from typing import Dict, List, TYPE_CHECKING
 from layer2.services.folder_generator import generate_folder_docs_async
 
 if TYPE_CHECKING:
     from config import DocGenConfig
 
+# Report separators, built once instead of on every write
+_EQ80 = "=" * 80
+_DASH80 = "─" * 80
+_EQ80_NL = _EQ80 + "\n"
+_DASH80_NL = _DASH80 + "\n"
+
+
+def _sha256(text: str) -> str:
+    """Hex SHA-256 digest of a UTF-8 string."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _dump(path: str, text: str) -> None:
+    """Write text to path in one buffered call (run via asyncio.to_thread)."""
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(text)
+
+
+def _write_bytes(path: str, blob: bytes) -> None:
+    """Write an encoded report straight to the fd, bypassing the buffered IO stack."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        mv = memoryview(blob)
+        written = 0
+        while written < len(mv):
+            written += os.write(fd, mv[written:])
+    finally:
+        os.close(fd)
+
 
 class OutputWriter:
     """Centralizes all file writing operations."""
@@ -21,29 +52,35 @@ class OutputWriter:
         self.config = config
         self.output_dir = os.path.abspath(config.output.output_dir)
         os.makedirs(self.output_dir, exist_ok=True)
+
+        # Output paths are fixed per instance
+        output = config.output
+        self._p_scc = os.path.join(self.output_dir, output.scc_contexts_file)
+        self._p_module = os.path.join(self.output_dir, output.module_docs_file)
+        self._p_folder = os.path.join(self.output_dir, output.folder_docs_file)
+        self._p_condensed = os.path.join(self.output_dir, output.condensed_file)
+        self._p_dep = os.path.join(self.output_dir, "dependency used.txt")
+        self._plan_cache_dir = os.path.join(config.cache.cache_dir, "plan")
     
-    def write_scc_contexts(self, scc_contexts_dict: Dict[str, str]) -> None:
-        """Export SCC contexts to a text file."""
-        if not scc_contexts_dict:
+    def write_scc_contexts(self, scc_contexts_list: List[str]) -> None:
+        """Export SCC contexts (in cycle order) to a text file."""
+        if not scc_contexts_list:
             return
         
-        output_file = os.path.join(self.output_dir, "scc_contexts.txt")
+        output_file = self._p_scc
         try:
-            with open(output_file, "w") as f:
-                f.write("="*80 + "\n")
-                f.write("STRONGLY CONNECTED COMPONENTS (CYCLE) ARCHITECTURE OVERVIEWS\n")
-                f.write("="*80 + "\n\n")
-                
-                for idx, (key, context) in enumerate(scc_contexts_dict.items(), 1):
-                    f.write(f"\n{'─'*80}\n")
-                    f.write(f"Cycle {idx}\n")
-                    f.write(f"{'─'*80}\n\n")
-                    f.write(context)
-                    f.write("\n")
-                
-                f.write("\n" + "="*80 + "\n")
-                f.write(f"Total cycles documented: {len(scc_contexts_dict)}\n")
-                f.write("="*80 + "\n")
+            parts = [
+                _EQ80_NL,
+                "STRONGLY CONNECTED COMPONENTS (CYCLE) ARCHITECTURE OVERVIEWS\n",
+                _EQ80_NL + "\n",
+            ]
+            for idx, context in enumerate(scc_contexts_list, 1):
+                parts.append(f"\n{_DASH80_NL}Cycle {idx}\n{_DASH80_NL}\n{context}\n")
+            parts.append("\n" + _EQ80_NL)
+            parts.append(f"Total cycles documented: {len(scc_contexts_list)}\n")
+            parts.append(_EQ80_NL)
+
+            _write_bytes(output_file, "".join(parts).encode("utf-8"))
             
             print(f"✓ SCC contexts exported to {output_file}")
         except Exception as e:
@@ -51,15 +88,17 @@ class OutputWriter:
     
     def write_module_docs(self, final_docs: Dict[str, str]) -> None:
         """Aggregate module-level docs into a single file."""
-        module_agg_path = os.path.join(self.output_dir, "Module level docum.txt")
+        if not final_docs:
+            print("ℹ️ No module docs to write")
+            return
+        module_agg_path = self._p_module
         print("\n📁 Writing aggregated module-level documentation...")
         try:
-            with open(module_agg_path, "w") as mf:
-                mf.write("MODULE LEVEL DOCUMENTATION\n")
-                mf.write("="*80 + "\n\n")
-                for module, doc in final_docs.items():
-                    mf.write(f"\n\n## Module: {module}\n\n")
-                    mf.write(doc)
+            parts = ["MODULE LEVEL DOCUMENTATION\n", _EQ80_NL + "\n"]
+            for module, doc in final_docs.items():
+                parts.append(f"\n\n## Module: {module}\n\n")
+                parts.append(doc)
+            _write_bytes(module_agg_path, "".join(parts).encode("utf-8"))
             print(f"✓ Module documentation aggregated to {module_agg_path}\n")
         except Exception as e:
             print(f"⚠️ Failed to write aggregated module docs: {e}\n")
@@ -85,17 +124,23 @@ class OutputWriter:
         try:
             # Call async version with semaphore and llm_config
             folder_docs, folder_tree = await generate_folder_docs_async(
-                analyzer, final_docs, semaphore, llm_config=self.config.llm
+                analyzer, final_docs, semaphore, llm_config=self.config.llm, cache_config=self.config.cache
             )
 
-            # Write to file (sync I/O is fine here)
-            folder_txt_path = os.path.join(self.output_dir, "Folder Level docum.txt")
+            if not folder_docs:
+                print("ℹ️ No folder docs to write\n")
+                return folder_docs, folder_tree
+
+            # Write to file off the event loop
+            folder_txt_path = self._p_folder
             try:
-                with open(folder_txt_path, "w") as ff:
-                    ff.write("FOLDER LEVEL DOCUMENTATION\n")
-                    ff.write("="*80 + "\n\n")
-                    for folder_path, description in folder_docs.items():
-                        ff.write(f"## {folder_path}\n\n{description}\n\n")
+                text = "".join([
+                    "FOLDER LEVEL DOCUMENTATION\n",
+                    _EQ80_NL + "\n",
+                    *(f"## {folder_path}\n\n{description}\n\n"
+                      for folder_path, description in folder_docs.items()),
+                ])
+                await asyncio.to_thread(_dump, folder_txt_path, text)
                 print(f"✓ Folder documentation written to {folder_txt_path}\n")
             except Exception as e:
                 print(f"⚠️ Failed to write folder-level text file: {e}\n")
@@ -110,58 +155,114 @@ class OutputWriter:
     # Legacy write_condensed_doc REMOVED
 
 
-    async def write_condensed_doc_with_planner(
+    def _plan_cache_key(self, analyzer, final_docs: Dict[str, str],
+                        folder_docs: Dict[str, str], folder_tree: dict) -> str:
+        """Hash the planner inputs into a cache key."""
+        return _sha256(json.dumps({
+            "model": self.config.llm.reasoner_model,
+            "modules": sorted(analyzer.module_index),
+            "ft": folder_tree,
+            "fd_hashes": {k: _sha256(v) for k, v in folder_docs.items()},
+            "md_hashes": {k: _sha256(v) for k, v in final_docs.items()},
+            "v": "plan-v1",
+        }, sort_keys=True, default=str))
+
+    def _load_plan_cache(self, key: str, suffix: str):
+        """Return a cached plan (.json) or condensed doc (.md), or None on miss."""
+        if not self.config.cache.enabled:
+            return None
+        path = os.path.join(self._plan_cache_dir, key + suffix)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f) if suffix == ".json" else f.read()
+        except (OSError, ValueError):
+            return None
+
+    def _store_plan_cache(self, key: str, suffix: str, value) -> None:
+        """Persist a plan or condensed doc atomically; failures only disable reuse."""
+        if not self.config.cache.enabled:
+            return
+        path = os.path.join(self._plan_cache_dir, key + suffix)
+        try:
+            os.makedirs(self._plan_cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                if suffix == ".json":
+                    json.dump(value, f)
+                else:
+                    f.write(value)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError) as e:
+            print(f"⚠️  Failed to cache plan output: {e}")
+
+    async def _generate_reviewed_plan(
         self,
         analyzer,
         final_docs: Dict[str, str],
         folder_docs: Dict[str, str],
         folder_tree: dict,
         semaphore: asyncio.Semaphore
-    ) -> None:
-        """
-        Generate condensed doc using planner agent (replaces old condenser).
+    ):
+        """Generate a documentation plan and run it through the review/retry loop.
 
-        Args:
-            analyzer: ImportGraph analyzer
-            final_docs: Module documentation dict
-            folder_docs: Folder documentation dict
-            folder_tree: Hierarchical folder structure from folder_write_async
-            semaphore: For rate limiting LLM calls
+        Returns:
+            Tuple of (plan, plan_valid); plan_valid is False when retries ran out
         """
-        print("📄 Generating documentation with planner agent...")
+        from layer2.plan_pipeline.planner import generate_documentation_plan
+        from layer2.plan_pipeline.reviewer import review_documentation_plan
 
-        try:
-            from layer2.plan_pipeline.planner import generate_documentation_plan
-            from layer2.plan_pipeline.reviewer import review_documentation_plan
-            from layer2.plan_pipeline.executor import execute_documentation_plan
+        # Step 1: Generate plan
+        plan = await generate_documentation_plan(
+            analyzer,
+            folder_docs,
+            folder_tree,
+            final_docs,
+            semaphore
+        )
 
-            # Step 1: Generate plan
-            plan = await generate_documentation_plan(
-                analyzer,
-                folder_docs,
-                folder_tree,
-                final_docs,
-                semaphore
-            )
+        # Step 2: Review plan with retry loop
+        max_plan_retries = self.config.processing.max_plan_retries
+        speculative_replan = self.config.processing.speculative_replan
+        plan_valid = False
 
-            # Step 2: Review plan with retry loop
-            max_plan_retries = self.config.processing.max_plan_retries
-            plan_valid = False
+        for attempt in range(max_plan_retries):
+            # Speculatively draft the next plan while this one is reviewed,
+            # so a failed review costs max(review, generate) instead of the sum.
+            # The draft cannot see this review's feedback.
+            next_plan_task = None
+            if speculative_replan and attempt < max_plan_retries - 1:
+                next_plan_task = asyncio.create_task(generate_documentation_plan(
+                    analyzer,
+                    folder_docs,
+                    folder_tree,
+                    final_docs,
+                    semaphore
+                ))
 
-            for attempt in range(max_plan_retries):
+            try:
                 valid, feedback = await review_documentation_plan(
                     plan,
                     analyzer,
                     folder_docs,
                     semaphore
                 )
+            except BaseException:
+                if next_plan_task:
+                    next_plan_task.cancel()
+                raise
 
-                if valid:
-                    plan_valid = True
-                    break
+            if valid:
+                plan_valid = True
+                if next_plan_task:
+                    next_plan_task.cancel()
+                break
 
-                if attempt < max_plan_retries - 1:
-                    print(f"⚠️  Plan revision needed (attempt {attempt + 1}/{max_plan_retries}): {feedback[:100]}...")
+            if attempt < max_plan_retries - 1:
+                print(f"⚠️  Plan revision needed (attempt {attempt + 1}/{max_plan_retries}): {feedback[:100]}...")
+                if next_plan_task:
+                    # Use the plan already in flight
+                    plan = await next_plan_task
+                else:
                     # Regenerate plan with feedback
                     plan = await generate_documentation_plan(
                         analyzer,
@@ -171,25 +272,77 @@ class OutputWriter:
                         semaphore,
                         reviewer_feedback=feedback
                     )
-                else:
-                    print(f"⚠️  Plan not perfect but proceeding: {feedback[:100]}...")
-
-            # Step 3: Execute plan (generate sections)
-            condensed_doc = await execute_documentation_plan(
-                plan,
-                analyzer,
-                folder_docs,
-                folder_tree,
-                final_docs,
-                semaphore,
-                use_reasoner=self.config.generation.use_reasoner,
-                config=self.config
-            )
+            else:
+                print(f"⚠️  Plan not perfect but proceeding: {feedback[:100]}...")
+
+        return plan, plan_valid
+
+    async def write_condensed_doc_with_planner(
+        self,
+        analyzer,
+        final_docs: Dict[str, str],
+        folder_docs: Dict[str, str],
+        folder_tree: dict,
+        semaphore: asyncio.Semaphore
+    ) -> None:
+        """
+        Generate condensed doc using planner agent (replaces old condenser).
+
+        Args:
+            analyzer: ImportGraph analyzer
+            final_docs: Module documentation dict
+            folder_docs: Folder documentation dict
+            folder_tree: Hierarchical folder structure from folder_write_async
+            semaphore: For rate limiting LLM calls
+        """
+        print("📄 Generating documentation with planner agent...")
+
+        try:
+            from layer2.plan_pipeline.executor import execute_documentation_plan
+
+            # Steps 1-2: Generate and review plan, reusing a cached plan when inputs are unchanged
+            plan_key = self._plan_cache_key(analyzer, final_docs, folder_docs, folder_tree)
+            plan = self._load_plan_cache(plan_key, ".json")
+            if plan is not None:
+                print("✓ Reusing cached documentation plan")
+            else:
+                plan, plan_valid = await self._generate_reviewed_plan(
+                    analyzer, final_docs, folder_docs, folder_tree, semaphore
+                )
+                # Only reviewed-and-accepted plans are reused on later runs
+                if plan_valid:
+                    self._store_plan_cache(plan_key, ".json", plan)
+
+            # Step 3: Execute plan (generate sections), keyed on the plan, the same inputs and
+            # every setting that picks the executor's models
+            use_reasoner = self.config.generation.use_reasoner
+            exec_key = _sha256(json.dumps({
+                "plan_key": plan_key,
+                "plan": plan,
+                "reasoner": use_reasoner,
+                "hybrid": self.config.generation.use_hybrid_rag_reasoner,
+                "chat_model": self.config.llm.chat_model,
+                "v": "exec-v1",
+            }, sort_keys=True))
+            condensed_doc = self._load_plan_cache(exec_key, ".md")
+            if condensed_doc is not None:
+                print("✓ Reusing cached planned documentation")
+            else:
+                condensed_doc = await execute_documentation_plan(
+                    plan,
+                    analyzer,
+                    folder_docs,
+                    folder_tree,
+                    final_docs,
+                    semaphore,
+                    use_reasoner=use_reasoner,
+                    config=self.config
+                )
+                self._store_plan_cache(exec_key, ".md", condensed_doc)
 
             # Write to file
-            condensed_path = os.path.join(self.output_dir, "Final Condensed.md")
-            with open(condensed_path, "w") as f:
-                f.write(condensed_doc)
+            condensed_path = self._p_condensed
+            await asyncio.to_thread(_dump, condensed_path, condensed_doc)
 
             print(f"✓ Planned documentation saved to {condensed_path}\n")
 
@@ -201,24 +354,26 @@ class OutputWriter:
     
     def write_dependency_usage(self, dependency_usage_log: Dict) -> None:
         """Aggregate dependency usage into one file."""
-        dep_used_path = os.path.join(self.output_dir, "dependency used.txt")
+        if not dependency_usage_log:
+            print("⚠️ No dependency usage data found to aggregate\n")
+            return
+
+        dep_used_path = self._p_dep
         try:
-            with open(dep_used_path, "w") as outf:
-                outf.write("Dependency usage report\n")
-                outf.write("="*80 + "\n\n")
-                
-                if dependency_usage_log:
-                    for module in sorted(dependency_usage_log.keys()):
-                        data = dependency_usage_log[module]
-                        outf.write(f"Module: {module}\n")
-                        outf.write(f"Scheduled at: {data['timestamp']}\n")
-                        outf.write("Dependencies:\n")
-                        for dep, present in sorted(data['dependencies'].items()):
-                            outf.write(f"  {dep}, {present}\n")
-                        outf.write("\n")
-                    print(f"✓ Aggregated dependency usages to {dep_used_path}\n")
-                else:
-                    outf.write("No dependency usage data found.\n")
-                    print(f"⚠️ No dependency usage data found to aggregate\n")
+            parts = ["Dependency usage report\n", _EQ80_NL + "\n"]
+            sorted_modules = sorted(dependency_usage_log.items())
+            for module, data in sorted_modules:
+                deps_block = "".join(
+                    f"  {dep}, {present}\n"
+                    for dep, present in sorted(data['dependencies'].items())
+                )
+                parts.append(
+                    f"Module: {module}\n"
+                    f"Scheduled at: {data['timestamp']}\n"
+                    f"Dependencies:\n{deps_block}\n"
+                )
+
+            _write_bytes(dep_used_path, "".join(parts).encode("utf-8"))
+            print(f"✓ Aggregated dependency usages to {dep_used_path}\n")
         except Exception as e:
             print(f"⚠️ Failed to write dependency used file: {e}\n")
\ No newline at end of file
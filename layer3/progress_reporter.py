@@ -3,6 +3,9 @@
 import time
 from typing import List
 
+# (timings key, display abbreviation) in display order
+_TIMING_KEYS = (("retrieve", "r"), ("write", "w"), ("review", "rv"))
+
 
 class ProgressReporter:
     """Handles all progress tracking, timing, and summary output."""
@@ -12,22 +15,20 @@ class ProgressReporter:
     
     def start(self):
         """Mark the start of generation."""
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
     
     def format_elapsed_time(self) -> str:
         """Format elapsed time from start."""
-        if not self.start_time:
+        if self.start_time is None:
             return "0s"
-        elapsed = time.time() - self.start_time
-        hours = int(elapsed // 3600)
-        mins = int((elapsed % 3600) // 60)
-        secs = int(elapsed % 60)
-        if hours > 0:
+        elapsed = int(time.monotonic() - self.start_time)
+        hours, rem = divmod(elapsed, 3600)
+        mins, secs = divmod(rem, 60)
+        if hours:
             return f"{hours}h {mins}m {secs}s"
-        elif mins > 0:
+        if mins:
             return f"{mins}m {secs}s"
-        else:
-            return f"{secs}s"
+        return f"{secs}s"
     
     def print_header(self):
         """Print the generation header."""
@@ -45,6 +46,11 @@ class ProgressReporter:
         elapsed = self.format_elapsed_time()
         print(f"\n[Batch {batch_num}/{total_batches}] Processing {module_count} modules in parallel... [{elapsed}]")
     
+    def print_dag_header(self, module_count: int):
+        """Print dependency-driven processing header."""
+        elapsed = self.format_elapsed_time()
+        print(f"\n[DAG] Processing {module_count} modules as their dependencies finish... [{elapsed}]")
+    
     def print_batch_complete(self, success_count: int, actual_processed: int, skipped_packages: int):
         """Print batch completion summary."""
         print(f"  ✓ Batch complete: {success_count}/{actual_processed} modules documented" + 
@@ -76,11 +82,6 @@ class ProgressReporter:
         """Format timing information for display."""
         if not timings:
             return ""
-        parts = []
-        if timings.get("retrieve") is not None:
-            parts.append(f"r:{timings['retrieve']:.1f}s")
-        if timings.get("write") is not None:
-            parts.append(f"w:{timings['write']:.1f}s")
-        if timings.get("review") is not None:
-            parts.append(f"rv:{timings['review']:.1f}s")
-        return " [" + ", ".join(parts) + "]" if parts else ""
\ No newline at end of file
+        parts = [f"{abbr}:{timings[key]:.1f}s" for key, abbr in _TIMING_KEYS
+                 if timings.get(key) is not None]
+        return f" [{', '.join(parts)}]" if parts else ""
\ No newline at end of file
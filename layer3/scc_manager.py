@@ -2,57 +2,180 @@
 
 import asyncio
 import ast
-from typing import Dict, List, Optional, Set, TYPE_CHECKING
-from layer2.schemas.agent_state import AgentState
+import functools
+import hashlib
+import io
+import multiprocessing
+import os
+import random
+import threading
+import tiktoken
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+from layer2.schemas.agent_state import RetrieveRequest
 from layer2.services.code_retriever import retrieve
-from layer2.module_pipeline.writer import scc_context_write
+from layer2.llm_cache import PROMPT_VERSION, cache_key, load_cached, store_cached
+from layer2.module_pipeline.writer import SCC_UNPARSED_PREFIX, scc_context_write, scc_context_write_batch
+from layer3.adaptive_semaphore import AdaptiveSemaphore, is_rate_limit_error
 
 if TYPE_CHECKING:
     from config import DocGenConfig
 
 
-def _extract_api_signatures(code: str, max_chars: int = 2000) -> str:
-    """Extract only class and function signatures from code (no bodies)."""
+# Upper bound on chars per token, used to pre-size char-based signature extraction
+_MAX_CHARS_PER_TOKEN = 4
+# Source size below which signature parsing stays on the retrieve threads: each spawned
+# worker re-imports the pipeline, which costs more than parsing a few MB of code
+_PROC_POOL_MIN_CHARS = 8_000_000
+
+
+@functools.lru_cache(maxsize=None)
+def _encoder() -> "tiktoken.Encoding":
+    """Return the cl100k_base encoding SCC token budgets are measured with, loaded on first use."""
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def _count_tokens(text: str) -> int:
+    """Count tokens the same way the SCC budgets are measured."""
+    return len(_encoder().encode(text, disallowed_special=()))
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Truncate text to at most max_tokens tokens, noting how many were omitted."""
+    enc = _encoder()
+    tokens = enc.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode(tokens[:max_tokens]) + f"\n\n... [truncated, {len(tokens) - max_tokens} tokens omitted]"
+
+
+@functools.lru_cache(maxsize=1024)
+def _extract_api_signatures(code: str, max_chars: int = 2000, cache_dir: Optional[str] = None) -> str:
+    """Extract API signatures, reusing results cached on disk under cache_dir (None disables it)."""
+    if cache_dir is None:
+        return _parse_api_signatures(code, max_chars)
+
+    key = hashlib.blake2b(f"{max_chars}\0{code}".encode("utf-8"), digest_size=16).hexdigest()
+    cache_path = os.path.join(cache_dir, f"{key}.txt")
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        pass
+
+    result = _parse_api_signatures(code, max_chars)
     try:
-        tree = ast.parse(code)
-        signatures = []
-
-        for node in ast.iter_child_nodes(tree):
-            if isinstance(node, ast.ClassDef):
-                # Get class with method signatures only
-                class_sig = f"class {node.name}:"
-                methods = []
-                for item in node.body:
-                    if isinstance(item, ast.FunctionDef):
-                        args = [a.arg for a in item.args.args][:5]
-                        args_str = ', '.join(args)
-                        if len(item.args.args) > 5:
-                            args_str += ', ...'
-                        methods.append(f"    def {item.name}({args_str}): ...")
-                if methods:
-                    class_sig += "\n" + "\n".join(methods[:15])  # Max 15 methods
-                signatures.append(class_sig)
-
-            elif isinstance(node, ast.FunctionDef):
-                args = [a.arg for a in node.args.args][:6]
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(result)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # Cache is best-effort
+    return result
+
+
+class _BudgetExceeded(Exception):
+    """Raised to stop signature extraction once the char budget is exceeded."""
+
+
+class _SignatureExtractor(ast.NodeVisitor):
+    """Streams top-level class/function signatures into a buffer, stopping at max_chars."""
+
+    def __init__(self):
+        self.max_chars = 0
+        self._buf = io.StringIO()
+        self._size = 0
+
+    def reset(self, max_chars: int) -> None:
+        """Prepare the extractor for a new module, reusing its buffer."""
+        self.max_chars = max_chars
+        self._buf.seek(0)
+        self._buf.truncate()
+        self._size = 0
+
+    def visit_Module(self, node: ast.Module) -> None:
+        for child in node.body:
+            self.visit(child)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        pass  # Only top-level defs and one level of methods are read; bodies are never walked
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        # Get class with method signatures only
+        class_sig = f"class {node.name}:"
+        methods = []
+        for item in node.body:
+            if isinstance(item, ast.FunctionDef):
+                args = [a.arg for a in item.args.args][:5]
                 args_str = ', '.join(args)
-                if len(node.args.args) > 6:
+                if len(item.args.args) > 5:
                     args_str += ', ...'
-                signatures.append(f"def {node.name}({args_str}): ...")
-
-        result = "\n\n".join(signatures)
-        if len(result) > max_chars:
-            result = result[:max_chars] + "\n... [signatures truncated]"
-        return result if result else code[:max_chars]
-    except:
-        # If AST parsing fails, return truncated code
+                methods.append(f"    def {item.name}({args_str}): ...")
+                if len(methods) == 15:  # Max 15 methods
+                    break
+        if methods:
+            class_sig += "\n" + "\n".join(methods)
+        self._emit(class_sig)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        args = [a.arg for a in node.args.args][:6]
+        args_str = ', '.join(args)
+        if len(node.args.args) > 6:
+            args_str += ', ...'
+        self._emit(f"def {node.name}({args_str}): ...")
+
+    def _emit(self, signature: str) -> None:
+        if self._size:
+            self._buf.write("\n\n")
+            self._size += 2
+        self._buf.write(signature)
+        self._size += len(signature)
+        if self._size > self.max_chars:
+            raise _BudgetExceeded
+
+    def result(self) -> str:
+        return self._buf.getvalue()
+
+
+# One extractor per thread, reused across calls (signature extraction also runs in executors)
+_extractor_local = threading.local()
+
+
+def _get_signature_extractor() -> _SignatureExtractor:
+    """Return this thread's reusable signature extractor."""
+    extractor = getattr(_extractor_local, "extractor", None)
+    if extractor is None:
+        extractor = _extractor_local.extractor = _SignatureExtractor()
+    return extractor
+
+
+def _parse_api_signatures(code: str, max_chars: int = 2000) -> str:
+    """Extract only class and function signatures from code (no bodies)."""
+    try:
+        tree = compile(code, "<sig>", "exec", flags=ast.PyCF_ONLY_AST)
+    except (SyntaxError, ValueError):
+        # If AST parsing fails (bad syntax or NUL bytes), return truncated code
         return code[:max_chars]
 
+    extractor = _get_signature_extractor()
+    extractor.reset(max_chars)
+    try:
+        extractor.visit(tree)
+    except _BudgetExceeded:
+        pass
+
+    result = extractor.result()
+    if len(result) > max_chars:
+        result = result[:max_chars] + "\n... [signatures truncated]"
+    return result if result else code[:max_chars]
+
 
 class SCCManager:
     """Manages SCC context generation for cyclic dependencies."""
 
-    def __init__(self, root_path: str, semaphore: asyncio.Semaphore, config: "DocGenConfig" = None):
+    def __init__(self, root_path: str, semaphore: AdaptiveSemaphore, config: "DocGenConfig" = None,
+                 *, retrieve_pool: ThreadPoolExecutor):
         # Load config if not provided
         if config is None:
             from config import DocGenConfig
@@ -61,109 +184,323 @@ class SCCManager:
         self.config = config
         self.root_path = root_path
         self.semaphore = semaphore
-        self.scc_contexts_dict: Dict[str, str] = {}
+        # Generated contexts in cycle order; cycle N is entry N-1
+        self.scc_contexts_list: List[str] = []
+        # module -> cycle id -> context, so each context is stored once rather than per member
+        self.scc_id_of: Dict[str, int] = {}
+        self.scc_context_by_id: Dict[int, str] = {}
+        # CPU-sized pool for disk + AST retrieval, owned by the caller; its worker count bounds concurrent retrieves
+        self._retrieve_pool = retrieve_pool
+
+        # On-disk signature cache, shared across retries and runs; None when caching is disabled
+        self._sig_cache_dir = os.path.join(config.cache.cache_dir, "sig") if config.cache.enabled else None
+        # Created on first very large SCC; signature parsing is CPU-bound
+        self._proc_pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_proc_pool(self, max_workers: int) -> ProcessPoolExecutor:
+        """Return the process pool used for signature extraction, creating it lazily."""
+        if self._proc_pool is None:
+            # Spawn rather than fork: the parent already runs retrieve and asyncio threads
+            self._proc_pool = ProcessPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, max_workers),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._proc_pool
+
+    def close(self) -> None:
+        """Shut down the signature process pool, if one was started."""
+        if self._proc_pool is not None:
+            self._proc_pool.shutdown(wait=True)
+            self._proc_pool = None
+
+    async def _retrieve_code(self, module: str) -> Tuple[str, ...]:
+        """Return a module's code chunks, running the retriever on the retrieve pool."""
+        request = RetrieveRequest(module, self.root_path)
+        retrieve_timeout = self.config.processing.retrieve_timeout
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(
+                loop.run_in_executor(self._retrieve_pool, retrieve, request), timeout=retrieve_timeout
+            )
+        except asyncio.TimeoutError:
+            # One slow module shouldn't sink the whole SCC; it is documented without its code
+            print(f"  ⚠️  Retrieve timed out after {retrieve_timeout}s for {module}")
+            return ()
+        return tuple(request.code_chunks)
     
     async def generate_scc_context(self, scc: Set[str]) -> Optional[str]:
         """Generate SCC context doc for cycles."""
         if len(scc) == 1:
             return None  # No context needed for independent modules
 
-        scc_list = sorted(scc)
-        scc_size = len(scc)
+        scc_tuple = tuple(sorted(scc))
+        code_chunks_dict = await self._prepare_scc_code(scc_tuple)
+        return await self._write_scc_context(scc_tuple, code_chunks_dict)
+
+    async def _prepare_scc_code(self, scc_tuple: Tuple[str, ...]) -> Dict[str, str]:
+        """Retrieve and budget the code of every module in an SCC."""
+        scc_size = len(scc_tuple)
         print(f"\n  📖 Generating SCC overview for {scc_size} modules...")
 
-        # Calculate per-module character limit based on SCC size
-        # Target ~60K total chars to stay within context window
-        MAX_TOTAL_CHARS = 60000
-        chars_per_module = MAX_TOTAL_CHARS // scc_size
+        # Calculate per-module token budget based on SCC size
+        MAX_TOTAL_TOKENS = self.config.llm.scc_context_tokens
+        tokens_per_module = MAX_TOTAL_TOKENS // scc_size
 
         # For very large SCCs, use API signatures only (not full code)
         use_signatures_only = scc_size > 15
         if use_signatures_only:
-            chars_per_module = min(chars_per_module, 2000)  # Signatures are compact
-            print(f"    (Very large SCC: using API signatures only, {chars_per_module} chars/module)")
+            tokens_per_module = min(tokens_per_module, 500)  # Signatures are compact
+            print(f"    (Very large SCC: using API signatures only, {tokens_per_module} tokens/module)")
         elif scc_size > 10:
-            chars_per_module = min(chars_per_module, 3000)  # Max 3KB per module for medium SCCs
-            print(f"    (Medium SCC: limiting to {chars_per_module} chars/module)")
-
-        # Retrieve code chunks for all modules in SCC
-        code_chunks_dict = {}
-        for module in scc_list:
-            state: AgentState = {
-                "file": module,
-                "dependencies": [],
-                "code_chunks": [],
-                "dependency_docs": [],
-                "draft_doc": None,
-                "review_passed": False,
-                "reviewer_suggestions": "",
-                "retry_count": 0,
-                "ROOT_PATH": self.root_path,
-                "scc_context": None,
-                "is_cyclic": True,
-            }
-            state = retrieve(state)
-            code_content = "\n".join(state["code_chunks"])
-
-            # For very large SCCs, extract only API signatures
-            if use_signatures_only:
-                code_content = _extract_api_signatures(code_content, chars_per_module)
-            elif len(code_content) > chars_per_module:
-                # Truncate if necessary
-                code_content = code_content[:chars_per_module] + f"\n\n... [truncated, {len(code_content) - chars_per_module} chars omitted]"
-
-            code_chunks_dict[module] = code_content
+            tokens_per_module = min(tokens_per_module, 750)  # Cap per module for medium SCCs
+            print(f"    (Medium SCC: limiting to {tokens_per_module} tokens/module)")
+
+        chunk_lists = await asyncio.gather(*(self._retrieve_code(module) for module in scc_tuple))
+
+        # Identical chunks (generated stubs, copied helpers) are sent once; later
+        # copies become a one-line pointer so the LLM still knows where they live
+        first_owner: Dict[str, str] = {}
+        codes = []
+        for module, chunks in zip(scc_tuple, chunk_lists):
+            kept = []
+            for chunk in chunks:
+                owner = first_owner.setdefault(chunk, module)
+                kept.append(chunk if owner == module else f"# (identical code shown under {owner})")
+            codes.append("\n".join(kept))
+
+        # Only sources large enough to repay worker startup are parsed across processes
+        executor = None
+        if use_signatures_only:
+            if sum(len(code) for code in codes) >= _PROC_POOL_MIN_CHARS:
+                executor = self._get_proc_pool(scc_size)
+            else:
+                executor = self._retrieve_pool
+
+        prepared = await asyncio.gather(*(
+            self._prepare_module_code(code, tokens_per_module, executor)
+            for code in codes
+        ))
+        return dict(zip(scc_tuple, prepared))
+
+    async def _prepare_module_code(self, code_content: str, max_tokens: int,
+                                   signature_executor: Optional[Executor]) -> str:
+        """Fit one module's code to its token budget, reducing it to API signatures when given an executor."""
+
+        # For very large SCCs, extract only API signatures off the event loop
+        if signature_executor is not None:
+            loop = asyncio.get_running_loop()
+            code_content = await loop.run_in_executor(
+                signature_executor, _extract_api_signatures,
+                code_content, max_tokens * _MAX_CHARS_PER_TOKEN, self._sig_cache_dir
+            )
+
+        # Truncate if necessary
+        return _truncate_to_tokens(code_content, max_tokens)
+
+    def _scc_cache_key(self, scc_tuple: Tuple[str, ...], code_chunks_dict: Dict[str, str]) -> str:
+        """Content-addressed LLM cache key for an SCC overview."""
+        return cache_key(("scc_context_write", PROMPT_VERSION, self.config.llm.chat_model, scc_tuple, code_chunks_dict))
+
+    async def _load_scc_cache(self, scc_tuple: Tuple[str, ...], code_chunks_dict: Dict[str, str]) -> Optional[str]:
+        """Return a cached SCC overview, or None on miss or when caching is disabled."""
+        return await load_cached(self._scc_cache_key(scc_tuple, code_chunks_dict), self.config.cache)
+
+    async def _store_scc_cache(self, scc_tuple: Tuple[str, ...], code_chunks_dict: Dict[str, str], context: str) -> None:
+        """Persist a parsed SCC overview; failures only disable reuse."""
+        # An unparsed fallback is still usable this run, but a retry next run may parse
+        if context.startswith(SCC_UNPARSED_PREFIX):
+            return
+        await store_cached(self._scc_cache_key(scc_tuple, code_chunks_dict), context, self.config.cache)
+
+    async def _write_scc_context(self, scc_tuple: Tuple[str, ...], code_chunks_dict: Dict[str, str]) -> Optional[str]:
+        """Generate one SCC overview from prepared code, retrying with smaller context on failure."""
+        cached = await self._load_scc_cache(scc_tuple, code_chunks_dict)
+        if cached is not None:
+            print("  ✓ SCC overview loaded from cache")
+            return cached
 
         # Generate SCC overview with retry logic
         max_retries = self.config.processing.scc_max_retries
         llm_config = self.config.llm
         current_code_chunks = code_chunks_dict.copy()
+        # Filled on the first context-length error: each module's signatures are
+        # extracted once, and later retries only re-slice them to a smaller budget
+        full_signatures: Dict[str, str] = {}
+        token_budgets: Dict[str, int] = {}
 
         for attempt in range(max_retries):
             try:
                 async with self.semaphore:
-                    context = await scc_context_write(scc_list, current_code_chunks, llm_config=llm_config)
-                print(f"  ✓ SCC overview generated")
+                    context = await scc_context_write(scc_tuple, current_code_chunks, llm_config=llm_config)
+                self.semaphore.on_success()
+                print("  ✓ SCC overview generated")
+                await self._store_scc_cache(scc_tuple, code_chunks_dict, context)
                 return context
             except Exception as e:
                 error_msg = str(e)
                 is_context_error = "context length" in error_msg.lower() or "maximum" in error_msg.lower()
+                if is_context_error or is_rate_limit_error(e):
+                    self.semaphore.on_error()
 
                 if attempt < max_retries - 1:
                     print(f"  ⚠️  SCC overview generation failed (attempt {attempt + 1}/{max_retries}): {error_msg[:80]}")
 
                     # If context length error, aggressively truncate for retry
                     if is_context_error:
-                        print(f"    → Reducing context size for retry...")
+                        print("    → Reducing context size for retry...")
+                        prev_size = sum(len(v) for v in current_code_chunks.values())
                         truncate_factor = 0.5 ** (attempt + 1)  # 50%, 25%, 12.5%...
+                        if not full_signatures:
+                            for module, content in code_chunks_dict.items():
+                                full_signatures[module] = _extract_api_signatures(content, len(content), self._sig_cache_dir)
+                                token_budgets[module] = _count_tokens(content)
                         for module in current_code_chunks:
-                            content = current_code_chunks[module]
-                            max_len = int(len(content) * truncate_factor)
-                            if max_len < 500:
-                                max_len = 500  # Minimum 500 chars
-                            current_code_chunks[module] = _extract_api_signatures(content, max_len)
+                            max_tokens = int(token_budgets[module] * truncate_factor)
+                            if max_tokens < 125:
+                                max_tokens = 125  # Minimum 125 tokens
+                            token_budgets[module] = max_tokens
+                            current_code_chunks[module] = _truncate_to_tokens(full_signatures[module], max_tokens)
 
-                    await asyncio.sleep(2 ** attempt)
+                        # Every module is already at the floor; a retry would fail the same way
+                        if sum(len(v) for v in current_code_chunks.values()) >= prev_size:
+                            print("  ❌ SCC overview still too large at minimum size, giving up")
+                            return None
+
+                    # Full-jitter backoff so parallel SCC tasks don't retry in lockstep
+                    max_backoff = self.config.processing.max_backoff
+                    await asyncio.sleep(random.uniform(0, min(max_backoff, 2 ** attempt)))
                 else:
                     print(f"  ❌ SCC overview generation failed after {max_retries} attempts")
                     return None
     
-    async def generate_all_scc_contexts(self, sccs: List[Set[str]]) -> Dict[str, str]:
-        """Pre-generate all SCC contexts and return module -> context mapping."""
+    async def _generate_scc_context_isolated(self, scc: Set[str]) -> Optional[str]:
+        """Generate one SCC context, recording failure as None so sibling cycles keep running."""
+        try:
+            return await self.generate_scc_context(scc)
+        except Exception as e:
+            print(f"  ⚠️  SCC overview generation raised: {str(e)[:80]}")
+            return None
+
+    async def _prepare_scc_code_isolated(self, scc_tuple: Tuple[str, ...]) -> Optional[Dict[str, str]]:
+        """Prepare one SCC's code, recording failure as None so sibling cycles keep running."""
+        try:
+            return await self._prepare_scc_code(scc_tuple)
+        except Exception as e:
+            print(f"  ⚠️  SCC code preparation raised: {str(e)[:80]}")
+            return None
+
+    async def _write_scc_context_isolated(self, scc_tuple: Tuple[str, ...],
+                                          code_chunks_dict: Dict[str, str]) -> Optional[str]:
+        """Write one SCC overview, recording failure as None so sibling cycles keep running."""
+        try:
+            return await self._write_scc_context(scc_tuple, code_chunks_dict)
+        except Exception as e:
+            print(f"  ⚠️  SCC overview generation raised: {str(e)[:80]}")
+            return None
+
+    async def _write_scc_context_batch(self, scc_tuples: List[Tuple[str, ...]],
+                                       code_chunks_dicts: List[Dict[str, str]]) -> List[Optional[str]]:
+        """Write overviews for several small SCCs in one LLM call, falling back to one call each."""
+        try:
+            async with self.semaphore:
+                contexts = await scc_context_write_batch(scc_tuples, code_chunks_dicts, llm_config=self.config.llm)
+            self.semaphore.on_success()
+            print(f"  ✓ SCC overviews generated for {len(scc_tuples)} cycles in one call")
+            for scc_tuple, code_chunks_dict, context in zip(scc_tuples, code_chunks_dicts, contexts):
+                await self._store_scc_cache(scc_tuple, code_chunks_dict, context)
+            return contexts
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self.semaphore.on_error()
+            print(f"  ⚠️  Batched SCC overview failed, generating individually: {str(e)[:80]}")
+            return list(await asyncio.gather(*(
+                self._write_scc_context_isolated(scc_tuple, code_chunks_dict)
+                for scc_tuple, code_chunks_dict in zip(scc_tuples, code_chunks_dicts)
+            )))
+
+    async def _generate_contexts_batched(self, cycles: List[Set[str]]) -> List[Optional[str]]:
+        """Generate contexts for all cycles, packing small ones into shared LLM calls."""
+        scc_tuples = [tuple(sorted(cycle)) for cycle in cycles]
+        results: List[Optional[str]] = [None] * len(cycles)
+        prepared: List[Optional[Dict[str, str]]] = [None] * len(cycles)
+        small_limit = self.config.llm.scc_batch_cycle_tokens
+        batch_limit = self.config.llm.scc_batch_tokens
+
+        async def prepare(idx: int):
+            return idx, await self._prepare_scc_code_isolated(scc_tuples[idx])
+
+        # Large cycles go to the LLM as soon as their code is ready; small ones wait to be packed
+        single_tasks = []
+        small: List[tuple] = []
+        for next_done in asyncio.as_completed([prepare(idx) for idx in range(len(cycles))]):
+            idx, code_chunks_dict = await next_done
+            if code_chunks_dict is None:
+                continue
+            prepared[idx] = code_chunks_dict
+            cached = await self._load_scc_cache(scc_tuples[idx], code_chunks_dict)
+            if cached is not None:
+                results[idx] = cached
+                continue
+            tokens = sum(_count_tokens(code) for code in code_chunks_dict.values())
+            if tokens > small_limit:
+                task = asyncio.create_task(self._write_scc_context_isolated(scc_tuples[idx], code_chunks_dict))
+                single_tasks.append((idx, task))
+            else:
+                small.append((idx, tokens))
+
+        # First-fit bin packing of small cycles (in cycle order) into batches under the token budget
+        small.sort()
+        bins: List[List[int]] = []
+        bin_tokens: List[int] = []
+        for idx, tokens in small:
+            for b, used in enumerate(bin_tokens):
+                if used + tokens <= batch_limit:
+                    bins[b].append(idx)
+                    bin_tokens[b] += tokens
+                    break
+            else:
+                bins.append([idx])
+                bin_tokens.append(tokens)
+
+        async def run_group(members: List[int]) -> List[Optional[str]]:
+            if len(members) == 1:
+                idx = members[0]
+                return [await self._write_scc_context_isolated(scc_tuples[idx], prepared[idx])]
+            return await self._write_scc_context_batch(
+                [scc_tuples[idx] for idx in members], [prepared[idx] for idx in members]
+            )
+
+        group_results = await asyncio.gather(*(run_group(members) for members in bins))
+        for members, contexts in zip(bins, group_results):
+            for idx, context in zip(members, contexts):
+                results[idx] = context
+        for idx, task in single_tasks:
+            results[idx] = await task
+        return results
+
+    async def generate_all_scc_contexts(self, sccs: List[Set[str]]) -> None:
+        """Pre-generate all SCC contexts into scc_id_of / scc_context_by_id."""
         print("📖 Pre-generating cycle architecture docs...")
-        scc_contexts: Dict[str, str] = {}
         cycles = [scc for scc in sccs if len(scc) > 1]
         
-        for cycle in cycles:
-            context = await self.generate_scc_context(cycle)
+        # Cycles are independent; the shared semaphore bounds in-flight LLM calls across all of them
+        if self.config.llm.scc_batch_tokens > 0:
+            results = await self._generate_contexts_batched(cycles)
+        else:
+            tasks = [asyncio.create_task(self._generate_scc_context_isolated(cycle)) for cycle in cycles]
+            results = await asyncio.gather(*tasks)
+
+        # Assign cycle ids in the original order so output stays deterministic
+        for cycle, context in zip(cycles, results):
             if context:
+                self.scc_contexts_list.append(context)
+                scc_id = len(self.scc_contexts_list)
+                self.scc_context_by_id[scc_id] = context
                 for module in cycle:
-                    scc_contexts[module] = context
-                self.scc_contexts_dict[f"cycle_{len(self.scc_contexts_dict)+1}"] = context
+                    self.scc_id_of[module] = scc_id
         
         print(f"✓ Generated {len(cycles)} cycle contexts\n")
-        return scc_contexts
     
-    def get_all_contexts(self) -> Dict[str, str]:
-        """Get all generated SCC contexts."""
-        return self.scc_contexts_dict
\ No newline at end of file
+    def get_all_contexts(self) -> List[str]:
+        """Get all generated SCC contexts, in cycle order."""
+        return self.scc_contexts_list
\ No newline at end of file
@@ -19,10 +19,13 @@ async def main():
     # )
 
     generator = AsyncDocGenerator(root_path="./", config=config)
-    final_docs = await generator.run()
+    try:
+        final_docs = await generator.run()
 
-    # Write all output files
-    await generator.write_all_outputs(final_docs)
+        # Write all output files
+        await generator.write_all_outputs(final_docs)
+    finally:
+        generator.close()
 
     # Print completion
     generator.reporter.print_completion()
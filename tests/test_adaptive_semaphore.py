@@ -0,0 +1,114 @@
+"""Tests for the AIMD concurrency limiter."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("openai")
+
+from layer3.adaptive_semaphore import AdaptiveSemaphore  # noqa: E402
+
+
+def test_release_hands_permit_to_oldest_waiter():
+    async def scenario():
+        sem = AdaptiveSemaphore(1)
+        await sem.acquire()
+        order = []
+
+        async def waiter(name):
+            await sem.acquire()
+            order.append(name)
+
+        first = asyncio.create_task(waiter("first"))
+        second = asyncio.create_task(waiter("second"))
+        await asyncio.sleep(0)
+
+        sem.release()
+        # The permit now belongs to the first waiter, so a newcomer cannot jump ahead
+        assert sem.locked()
+        await first
+        assert order == ["first"]
+
+        sem.release()
+        await second
+        assert order == ["first", "second"]
+        sem.release()
+        assert not sem.locked()
+
+    asyncio.run(scenario())
+
+
+def test_cancel_after_grant_returns_the_permit():
+    async def scenario():
+        sem = AdaptiveSemaphore(1)
+        await sem.acquire()
+        waiter = asyncio.create_task(sem.acquire())
+        await asyncio.sleep(0)
+
+        # Hand the permit over, then cancel before the waiter gets to run
+        sem.release()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert not sem.locked()
+        await asyncio.wait_for(sem.acquire(), timeout=1)
+
+    asyncio.run(scenario())
+
+
+def test_shrinking_below_in_flight_waits_for_drain():
+    async def scenario():
+        sem = AdaptiveSemaphore(4)
+        for _ in range(4):
+            await sem.acquire()
+
+        sem.on_error()
+        assert sem.limit == 2
+        waiter = asyncio.create_task(sem.acquire())
+        await asyncio.sleep(0)
+
+        # Held permits are never revoked; new work waits until in-flight drops below the new limit
+        sem.release()
+        sem.release()
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        sem.release()
+        await asyncio.wait_for(waiter, timeout=1)
+        assert sem.locked()
+
+    asyncio.run(scenario())
+
+
+def test_on_success_grows_limit_and_wakes_waiters():
+    async def scenario():
+        sem = AdaptiveSemaphore(2)
+        sem.on_error()
+        assert sem.limit == 1
+        await sem.acquire()
+        waiter = asyncio.create_task(sem.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        sem.on_success()
+        assert sem.limit == 2
+        await asyncio.wait_for(waiter, timeout=1)
+
+        sem.on_success()
+        assert sem.limit == 2  # Capped at max_permits
+
+    asyncio.run(scenario())
+
+
+def test_on_error_never_drops_below_min_permits():
+    sem = AdaptiveSemaphore(8, min_permits=3)
+    for _ in range(5):
+        sem.on_error()
+    assert sem.limit == 3
+
+
+def test_release_without_acquire_raises():
+    sem = AdaptiveSemaphore(2)
+    with pytest.raises(ValueError):
+        sem.release()
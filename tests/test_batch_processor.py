@@ -0,0 +1,106 @@
+"""Tests for BatchProcessor's cached module writes."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+for _dep in ("dotenv", "openai", "tqdm", "networkx", "tiktoken"):
+    pytest.importorskip(_dep)
+
+from config import CacheConfig, DocGenConfig  # noqa: E402
+from layer3 import batch_processor  # noqa: E402
+from layer3.adaptive_semaphore import AdaptiveSemaphore  # noqa: E402
+
+
+@pytest.fixture
+def retrieve_pool():
+    pool = ThreadPoolExecutor(max_workers=1)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def _state(retry_count: int, suggestions: str) -> dict:
+    return {
+        "file": "pkg.mod",
+        "dependencies": [],
+        "code_chunks": ["def f():\n    return 1"],
+        "dependency_docs": (),
+        "draft_doc": None,
+        "review_passed": False,
+        "reviewer_suggestions": suggestions,
+        "retry_count": retry_count,
+        "ROOT_PATH": ".",
+        "scc_context": None,
+        "is_cyclic": False,
+    }
+
+
+def test_unparsed_retry_is_not_cached_with_stale_doc_data(tmp_path, monkeypatch, retrieve_pool):
+    calls = []
+
+    async def fake_module_write(state, llm_config=None):
+        calls.append(state["retry_count"])
+        if state["retry_count"] == 0:
+            state["doc_data"] = {"summary": "parsed"}
+            state["draft_doc"] = "formatted doc"
+        else:
+            # Parse failure: module_write leaves doc_data untouched and stores the raw response
+            state["draft_doc"] = "Module Documentation for pkg.mod:\nraw\n"
+        return state
+
+    monkeypatch.setattr(batch_processor, "module_write", fake_module_write)
+    config = DocGenConfig(cache=CacheConfig(enabled=True, cache_dir=str(tmp_path)))
+    processor = batch_processor.BatchProcessor(".", None, AdaptiveSemaphore(2), config, retrieve_pool=retrieve_pool)
+
+    async def scenario():
+        state = await processor._write_cached(_state(0, ""), config.llm)
+        assert state["doc_data"] == {"summary": "parsed"}
+
+        # The retry carries the first attempt's doc_data into module_write
+        retry = _state(1, "be more specific")
+        retry["doc_data"] = state["doc_data"]
+        retry = await processor._write_cached(retry, config.llm)
+        assert retry["doc_data"] is None
+        assert retry["draft_doc"].startswith("Module Documentation")
+
+        # Same inputs again: the unparsed draft must not have been cached
+        again = _state(1, "be more specific")
+        again["doc_data"] = {"summary": "parsed"}
+        await processor._write_cached(again, config.llm)
+
+    asyncio.run(scenario())
+    assert calls == [0, 1, 1]
+
+
+def test_review_miss_is_not_applied_twice(tmp_path, monkeypatch, retrieve_pool):
+    calls = []
+
+    async def fake_review(state, llm_config=None, timeout=None):
+        calls.append(state["retry_count"])
+        # Records its verdict but leaves retry_count to the caller
+        state["review_passed"] = True
+        state["reviewer_suggestions"] = ""
+        state["last_review_time"] = 1.5
+        return state
+
+    monkeypatch.setattr(batch_processor, "review", fake_review)
+    config = DocGenConfig(cache=CacheConfig(enabled=True, cache_dir=str(tmp_path)))
+    processor = batch_processor.BatchProcessor(".", None, AdaptiveSemaphore(2), config, retrieve_pool=retrieve_pool)
+
+    async def scenario():
+        miss = _state(0, "")
+        miss["draft_doc"] = "formatted doc"
+        miss = await processor._review_cached(miss, config.llm, 60)
+        assert miss["last_review_time"] == 1.5
+        assert miss["retry_count"] == 0
+
+        hit = _state(0, "")
+        hit["draft_doc"] = "formatted doc"
+        hit = await processor._review_cached(hit, config.llm, 60)
+        assert hit["review_passed"] is True
+        assert hit["last_review_time"] == 0.0
+        assert hit["retry_count"] == 1
+
+    asyncio.run(scenario())
+    assert calls == [0]